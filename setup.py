@@ -7,9 +7,10 @@ setup(
     name="the_dojo",
     version="1.0.0",
     packages=find_packages('src'),
+    py_modules=['cli'],
     package_dir={'': 'src'},
     install_requires=[
-        'docopt>=0.6.2',
+        'SQLAlchemy>=2.0.0',
     ],
     entry_points={
         'console_scripts': [
@@ -1,12 +1,92 @@
 """
 Command Line Interface for The Dojo - Office Space Allocation.
 """
+import argparse
+import itertools
 import os
 import sys
-from docopt import docopt
 from models.dojo import Dojo
 from models.db.service import DatabaseService
 
+# Valid values for command arguments
+_PERSON_TYPES = frozenset({'FELLOW', 'STAFF'})
+_YN = frozenset({'Y', 'N'})
+_ROOM_TYPES = frozenset({'office', 'living_space'})
+
+
+# Help text shown after the command list
+_CLI_DOC = '''Room Types:
+  office            Office space (max 6 people).
+  living_space      Living space (max 4 people, for fellows only).
+
+Person Types:
+  FELLOW            A fellow who can be allocated both office and living space.
+  STAFF             A staff member who can only be allocated an office.
+
+Accommodation:
+  Y                 For fellows who want living space.
+  N                 For fellows who don't want living space (default).
+'''
+
+
+def _build_parser():
+    """
+    Build the argument parser for the Dojo CLI.
+    
+    Returns:
+        argparse.ArgumentParser: Parser with one subcommand per Dojo command
+    """
+    parser = argparse.ArgumentParser(
+        prog='dojo',
+        description='The Dojo - Office Space Allocation',
+        epilog=_CLI_DOC,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--version', action='version', version='The Dojo 1.0')
+    subparsers = parser.add_subparsers(dest='command', metavar='<command>')
+    subparsers.required = True
+    
+    create_room = subparsers.add_parser('create_room', help='Create rooms in the Dojo.')
+    create_room.add_argument('room_type')
+    create_room.add_argument('room_name', nargs='+')
+    
+    add_person = subparsers.add_parser(
+        'add_person', help='Add a person to the Dojo and allocate them a room.')
+    add_person.add_argument('person_name')
+    add_person.add_argument('person_type', metavar='FELLOW|STAFF')
+    add_person.add_argument('wants_accommodation', nargs='?', default='N')
+    
+    reallocate_person = subparsers.add_parser(
+        'reallocate_person', help='Move a person to a different room.')
+    reallocate_person.add_argument('person_identifier')
+    reallocate_person.add_argument('new_room_name')
+    
+    load_people = subparsers.add_parser('load_people', help='Add people listed in a text file.')
+    load_people.add_argument('filename')
+    
+    print_room = subparsers.add_parser('print_room', help='Print all occupants of a room.')
+    print_room.add_argument('room_name')
+    
+    for command, help_text in (('print_allocations', 'Print room allocations.'),
+                               ('print_unallocated', 'Print unallocated people.')):
+        printer = subparsers.add_parser(command, help=help_text)
+        printer.add_argument('-o', '--o', dest='o', metavar='filename',
+                             help='Output to the specified file.')
+    
+    save_state = subparsers.add_parser(
+        'save_state', help='Save the current state to a SQLite database.')
+    save_state.add_argument('--db', metavar='sqlite_database',
+                            help='Path to SQLite database file.')
+    
+    load_state = subparsers.add_parser('load_state', help='Load state from a SQLite database.')
+    load_state.add_argument('sqlite_database')
+    
+    return parser
+
+
+# Built once per process so each run() only has to match argv
+_PARSER = _build_parser()
+
 
 class DojoApp:
     """Main application class for the Dojo CLI."""
@@ -14,107 +94,99 @@ class DojoApp:
     # Default database path (can be overridden)
     DEFAULT_DB_PATH = os.path.join(os.path.expanduser('~'), '.dojo', 'dojo.db')
     
-    def __init__(self):
-        """Initialize the Dojo application with a new Dojo instance."""
+    def __init__(self, writer=None):
+        """
+        Initialize the Dojo application with a new Dojo instance.
+        
+        Args:
+            writer (callable, optional): Called with each chunk of CLI output.
+                                         Defaults to the current sys.stdout.write.
+        """
+        self._writer = writer
         self.dojo = Dojo()
         self.db_service = DatabaseService()
     
-    def run(self):
-        """Run the CLI application."""
-        # Define the command line interface specification
-        __doc__ = '''The Dojo - Office Space Allocation
-
-        Usage:
-          dojo create_room <room_type> <room_name>...
-          dojo add_person <person_name> <FELLOW|STAFF> [wants_accommodation]
-          dojo reallocate_person <person_identifier> <new_room_name>
-          dojo load_people <filename>
-          dojo print_room <room_name>
-          dojo print_allocations [--o=filename]
-          dojo print_unallocated [--o=filename]
-          dojo save_state [--db=<sqlite_database>]
-          dojo load_state <sqlite_database>
-          dojo (-h | --help)
-          dojo --version
-
-        Options:
-          -h --help         Show this screen.
-          --version         Show version.
-          -o=filename       Output to the specified file.
-        
-        Commands:
-          create_room       Create rooms in the Dojo.
-          add_person        Add a person to the Dojo and allocate them a room.
-          print_room        Print all occupants of a room.
-          print_allocations Print room allocations.
-          print_unallocated Print unallocated people.
-          save_state        Save the current state to a SQLite database.
-          load_state        Load state from a SQLite database.
-        
-        Room Types:
-          office            Office space (max 6 people).
-          living_space      Living space (max 4 people, for fellows only).
-        
-        Database Options:
-          --db=<sqlite_database>  Path to SQLite database file.
-        
-        Person Types:
-          FELLOW            A fellow who can be allocated both office and living space.
-          STAFF             A staff member who can only be allocated an office.
+    @property
+    def dojo(self):
+        """Dojo: The app's Dojo, which writes through the app's writer."""
+        return self._dojo
+    
+    @dojo.setter
+    def dojo(self, dojo):
+        dojo.writer = self._writer
+        self._dojo = dojo
+    
+    def _write(self, text):
+        """
+        Send CLI output to the app's writer.
         
-        Accommodation:
-          Y                 For fellows who want living space.
-          N                 For fellows who don't want living space (default).
-        '''
+        Args:
+            text (str): Text to write, including any trailing newline
+        """
+        if self._writer is not None:
+            self._writer(text)
+        else:
+            sys.stdout.write(text)
+    
+    def run(self, argv=None):
+        """
+        Run the CLI application.
         
-        # Parse command line arguments
-        args = docopt(__doc__, version='The Dojo 1.0')
+        Args:
+            argv (list, optional): Arguments to parse. Defaults to sys.argv[1:].
+        """
+        # Parse command line arguments with the parser built at import time
+        args = _PARSER.parse_args(argv)
         
         try:
-            if args['create_room']:
-                self.create_room(args['<room_type>'], args['<room_name>'])
-            elif args['add_person']:
+            if args.command == 'create_room':
+                self.create_room(args.room_type, args.room_name)
+            elif args.command == 'add_person':
                 self.add_person(
-                    args['<person_name>'],
-                    args['<FELLOW|STAFF>'],
-                    args.get('<wants_accommodation>', 'N')
+                    args.person_name,
+                    args.person_type,
+                    args.wants_accommodation
                 )
-            elif args['print_room']:
-                self.print_room(args['<room_name>'])
-            elif args['print_allocations']:
-                self.print_allocations(args.get('--o'))
-            elif args['print_unallocated']:
-                self.print_unallocated(args.get('--o'))
-            elif args['reallocate_person']:
-                self.reallocate_person(args['<person_identifier>'], args['<new_room_name>'])
-            elif args['load_people']:
-                self.load_people(args['<filename>'])
-            elif args['save_state']:
-                self.save_state(args['--db'])
-            elif args['load_state']:
-                self.load_state(args['<sqlite_database>'])
+            elif args.command == 'print_room':
+                self.print_room(args.room_name)
+            elif args.command == 'print_allocations':
+                self.print_allocations(args.o)
+            elif args.command == 'print_unallocated':
+                self.print_unallocated(args.o)
+            elif args.command == 'reallocate_person':
+                self.reallocate_person(args.person_identifier, args.new_room_name)
+            elif args.command == 'load_people':
+                self.load_people(args.filename)
+            elif args.command == 'save_state':
+                self.save_state(args.db)
+            elif args.command == 'load_state':
+                self.load_state(args.sqlite_database)
         except Exception as e:
             print(f"Error: {str(e)}", file=sys.stderr)
             sys.exit(1)
+        finally:
+            # Closing the engines checkpoints any WAL and removes its sidecar files
+            self.db_service.close()
     
-    def create_room(self, room_type, room_names):
+    def create_room(self, room_type, room_names, verbose=True):
         """
         Create one or more rooms in the Dojo.
         
         Args:
             room_type (str): Type of room to create ('office' or 'living_space')
             room_names (list): List of room names to create
+            verbose (bool): If True, announce each created room
             
         Returns:
             bool: True if any rooms were created, False otherwise
         """
-        if room_type not in ['office', 'living_space']:
-            print(f"Error: Invalid room type '{room_type}'. Must be 'office' or 'living_space'.")
+        if room_type not in _ROOM_TYPES:
+            self._write(f"Error: Invalid room type '{room_type}'. Must be 'office' or 'living_space'.\n")
             return False
             
-        return self.dojo.create_room(room_type, room_names)
+        return self.dojo.create_room(room_type, room_names, verbose=verbose)
     
-    def add_person(self, name, person_type, wants_accommodation="N"):
+    def add_person(self, name, person_type, wants_accommodation="N", verbose=True):
         """
         Add a person to the Dojo and allocate them rooms.
         
@@ -122,25 +194,26 @@ class DojoApp:
             name (str): Person's name
             person_type (str): Type of person ('FELLOW' or 'STAFF')
             wants_accommodation (str): 'Y' if they want accommodation, 'N' otherwise
+            verbose (bool): If True, announce the person's allocations
             
         Returns:
             bool: True if person was added successfully, False otherwise
         """
         person_type = person_type.upper()
-        if person_type not in ['FELLOW', 'STAFF']:
-            print(f"Error: Invalid person type '{person_type}'. Must be 'FELLOW' or 'STAFF'.")
+        if person_type not in _PERSON_TYPES:
+            self._write(f"Error: Invalid person type '{person_type}'. Must be 'FELLOW' or 'STAFF'.\n")
             return False
             
         wants_accommodation = wants_accommodation.upper()
-        if wants_accommodation not in ['Y', 'N']:
-            print(f"Error: Invalid accommodation option '{wants_accommodation}'. Must be 'Y' or 'N'.")
+        if wants_accommodation not in _YN:
+            self._write(f"Error: Invalid accommodation option '{wants_accommodation}'. Must be 'Y' or 'N'.\n")
             return False
             
         if person_type == 'STAFF' and wants_accommodation == 'Y':
-            print("Error: Staff cannot be allocated living spaces.")
+            self._write("Error: Staff cannot be allocated living spaces.\n")
             return False
             
-        return self.dojo.add_person(name, person_type, wants_accommodation)
+        return self.dojo.add_person(name, person_type, wants_accommodation, verbose=verbose)
     
     def print_room(self, room_name):
         """
@@ -149,74 +222,74 @@ class DojoApp:
         Args:
             room_name (str): Name of the room to print
         """
-        room = None
-        # Check offices
-        for office in self.dojo.offices:
-            if office.name.lower() == room_name.lower():
-                room = office
-                break
-        
-        # If not found in offices, check living spaces
-        if not room:
-            for living_space in self.dojo.living_spaces:
-                if living_space.name.lower() == room_name.lower():
-                    room = living_space
-                    break
+        room, _ = self.dojo.find_room(room_name)
         
         if not room:
-            print(f"Room '{room_name}' not found.")
+            self._write(f"Room '{room_name}' not found.\n")
             return
         
-        print(f"Room: {room.name}")
-        print("Type:", "Office" if room.room_type == "office" else "Living Space")
-        print("Occupants:")
+        self._write(f"Room: {room.name}\n")
+        self._write(f"Type: {'Office' if room.room_type == 'office' else 'Living Space'}\n")
+        self._write("Occupants:\n")
         for occupant_id in room.occupants:
-            # Find person by ID
-            person = next((p for p in self.dojo.people if p.person_id == occupant_id), None)
+            person = self.dojo.get_person(occupant_id)
             if person:
-                print(f"  - {person.name} ({person.person_type})")
+                self._write(f"  - {person.name} ({person.person_type})\n")
     
-    def print_allocations(self, filename=None):
+    def print_allocations(self, filename=None, out=None):
         """
         Print a list of allocations to screen or file.
         
         Args:
             filename (str, optional): If provided, output will be written to this file
+            out (file, optional): Stream to write to when no filename is given.
+                                  Defaults to the app's writer.
         """
-        output = []
-        
-        # Add offices
-        if self.dojo.offices:
-            output.append("OFFICES")
-            output.append("=" * 50)
-            for office in self.dojo.offices:
-                output.append(f"\n{office.name} ({len(office.occupants)}/{office.capacity}):")
-                for occupant_id in office.occupants:
-                    person = next((p for p in self.dojo.people if p.person_id == occupant_id), None)
-                    if person:
-                        output.append(f"  - {person.name}")
+        if filename:
+            with open(filename, 'w') as f:
+                self._write_allocations(f.write)
+        else:
+            self._write_allocations(out.write if out is not None else self._write)
+    
+    def _write_allocations(self, write):
+        """
+        Stream the allocations report through a write function, one line at a time.
         
-        # Add living spaces
-        if self.dojo.living_spaces:
-            output.append("\nLIVING SPACES")
-            output.append("=" * 50)
-            for living_space in self.dojo.living_spaces:
-                output.append(f"\n{living_space.name} ({len(living_space.occupants)}/{living_space.capacity}):")
-                for occupant_id in living_space.occupants:
-                    person = next((p for p in self.dojo.people if p.person_id == occupant_id), None)
-                    if person:
-                        output.append(f"  - {person.name}")
+        Args:
+            write (callable): Called with each line of the report
+        """
+        names_by_room = self._occupant_names()
+        
+        # Write offices, then living spaces
+        sections = (("OFFICES", self.dojo.offices), ("\nLIVING SPACES", self.dojo.living_spaces))
+        for heading, rooms in sections:
+            if not rooms:
+                continue
+            write(heading + "\n")
+            write("=" * 50 + "\n")
+            for room in rooms:
+                write(f"\n{room.name} ({room.occupant_count}/{room.capacity}):\n")
+                for name in names_by_room[room.name]:
+                    write(f"  - {name}\n")
         
         # If no allocations yet
-        if not output:
-            output = ["No room allocations to display."]
+        if not self.dojo.offices and not self.dojo.living_spaces:
+            write("No room allocations to display.\n")
+    
+    def _occupant_names(self):
+        """
+        Resolve the occupant names of every room in a single pass.
         
-        # Print or write to file
-        if filename:
-            with open(filename, 'w') as f:
-                f.write("\n".join(output))
-        else:
-            print("\n".join(output))
+        Returns:
+            dict: Room name -> list of occupant names, in allocation order
+        """
+        get_person = self.dojo.get_person
+        names_by_room = {}
+        for room in itertools.chain(self.dojo.offices, self.dojo.living_spaces):
+            names_by_room[room.name] = [person.name
+                                        for person in map(get_person, room.occupants)
+                                        if person is not None]
+        return names_by_room
     
     def reallocate_person(self, person_id, new_room_name):
         """
@@ -230,42 +303,27 @@ class DojoApp:
             bool: True if reallocation was successful, False otherwise
         """
         # Find the person by ID
-        person = next((p for p in self.dojo.people if p.person_id == person_id), None)
+        person = self.dojo.get_person(person_id)
         if not person:
-            print(f"Error: Person with ID '{person_id}' not found.")
+            self._write(f"Error: Person with ID '{person_id}' not found.\n")
             return False
             
-        # Find the new room (check both offices and living spaces)
-        new_room = None
-        new_room_type = None
+        # Find the new room (offices take precedence over living spaces)
+        new_room, new_room_type = self.dojo.find_room(new_room_name)
         
-        # Check offices first
-        for office in self.dojo.offices:
-            if office.name.lower() == new_room_name.lower():
-                new_room = office
-                new_room_type = 'office'
-                break
-        
-        # If not found in offices, check living spaces
-        if not new_room:
-            for living_space in self.dojo.living_spaces:
-                if living_space.name.lower() == new_room_name.lower():
-                    # Only allow living space reallocation for Fellows who want accommodation
-                    if person.person_type == 'FELLOW' and person.wants_accommodation:
-                        new_room = living_space
-                        new_room_type = 'living_space'
-                    else:
-                        print("Error: Only Fellows who have requested accommodation can be allocated to living spaces.")
-                        return False
-                    break
+        # Only allow living space reallocation for Fellows who want accommodation
+        if new_room_type == 'living_space' and not (
+                person.person_type == 'FELLOW' and person.wants_accommodation):
+            self._write("Error: Only Fellows who have requested accommodation can be allocated to living spaces.\n")
+            return False
         
         if not new_room:
-            print(f"Error: Room '{new_room_name}' not found or not suitable for this person.")
+            self._write(f"Error: Room '{new_room_name}' not found or not suitable for this person.\n")
             return False
             
         # Check if the new room is full
-        if len(new_room.occupants) >= new_room.capacity:
-            print(f"Error: {new_room.name} is already at full capacity.")
+        if new_room.is_full():
+            self._write(f"Error: {new_room.name} is already at full capacity.\n")
             return False
             
         # Find the person's current room of the same type
@@ -273,20 +331,20 @@ class DojoApp:
         rooms_to_check = self.dojo.offices if new_room_type == 'office' else self.dojo.living_spaces
         
         for room in rooms_to_check:
-            if person_id in room.occupants:
+            if room.has_occupant(person_id):
                 current_room = room
                 break
         
         # If person is already in the target room
-        if current_room and current_room.name.lower() == new_room.name.lower():
-            print(f"{person.name} is already in {new_room.name}.")
+        if current_room is new_room:
+            self._write(f"{person.name} is already in {new_room.name}.\n")
             return False
             
         # Perform the reallocation
         try:
             # Remove from current room if any
             if current_room:
-                current_room.occupants.remove(person_id)
+                current_room.remove_occupant(person_id)
                 
                 # Update allocation status based on room type
                 if current_room.room_type == 'office':
@@ -294,20 +352,20 @@ class DojoApp:
                 elif current_room.room_type == 'living_space':
                     person.living_space_allocated = False
             
-            # Add to new room
-            new_room.occupants.append(person_id)
+            # Add to new room; the checks above already cover add_occupant's
+            new_room.add_occupant_unchecked(person_id)
             
-            # Update person's allocation status
+            # Record the room's name, as the initial allocation does
             if new_room.room_type == 'office':
-                person.office_allocated = True
+                person.office_allocated = new_room.name
             else:
-                person.living_space_allocated = True
+                person.living_space_allocated = new_room.name
                 
-            print(f"{person.name} has been reallocated to {new_room.name}.")
+            self._write(f"{person.name} has been reallocated to {new_room.name}.\n")
             return True
             
         except Exception as e:
-            print(f"Error during reallocation: {str(e)}")
+            self._write(f"Error during reallocation: {str(e)}\n")
             return False
     
     def load_people(self, filename):
@@ -321,59 +379,57 @@ class DojoApp:
             bool: True if any people were added successfully, False otherwise
         """
         try:
+            parsed = []
             with open(filename, 'r') as file:
-                lines = file.readlines()
-                
-            added_count = 0
-            for line in lines:
-                # Skip empty lines and comments
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
+                # Stream the file line by line rather than reading it all up front
+                for line in file:
+                    # Skip empty lines and comments
+                    line = line.strip()
+                    if not line or line.startswith('#'):
+                        continue
                     
-                # Parse the line (format: FIRSTNAME LASTNAME PERSON_TYPE [ACCOMMODATION])
-                parts = line.split()
-                if len(parts) < 2:  # At least first name and type needed
-                    print(f"Warning: Invalid line format: {line}")
-                    continue
+                    # Parse the line (format: FIRSTNAME LASTNAME PERSON_TYPE [ACCOMMODATION])
+                    parts = line.split()
+                    if len(parts) < 2:  # At least first name and type needed
+                        self._write(f"Warning: Invalid line format: {line}\n")
+                        continue
                     
-                # Extract person type (last part or second last part)
-                if parts[-1].upper() in ['Y', 'N']:
-                    wants_accommodation = parts[-1].upper()
-                    person_type = parts[-2].upper()
-                    name = ' '.join(parts[:-2])
-                else:
-                    wants_accommodation = 'N'  # Default to 'N' if not specified
-                    person_type = parts[-1].upper()
-                    name = ' '.join(parts[:-1])
+                    # Extract person type (last part or second last part)
+                    if parts[-1].upper() in _YN:
+                        wants_accommodation = parts[-1].upper()
+                        person_type = parts[-2].upper()
+                        name = ' '.join(parts[:-2])
+                    else:
+                        wants_accommodation = 'N'  # Default to 'N' if not specified
+                        person_type = parts[-1].upper()
+                        name = ' '.join(parts[:-1])
                 
-                # Validate person type
-                if person_type not in ['FELLOW', 'STAFF']:
-                    print(f"Warning: Invalid person type '{person_type}' in line: {line}")
-                    continue
+                    # Validate person type
+                    if person_type not in _PERSON_TYPES:
+                        self._write(f"Warning: Invalid person type '{person_type}' in line: {line}\n")
+                        continue
                     
-                # Add the person
-                success = self.add_person(
-                    name=name,
-                    person_type=person_type,
-                    wants_accommodation=wants_accommodation
-                )
-                
-                if success:
-                    added_count += 1
+                    if person_type == 'STAFF' and wants_accommodation == 'Y':
+                        self._write("Error: Staff cannot be allocated living spaces.\n")
+                        continue
+                    
+                    parsed.append((name, person_type, wants_accommodation))
+            
+            # Add everyone in one batch so rooms are allocated in a single pass
+            added_count = self.dojo.add_people_bulk(parsed)
             
             if added_count > 0:
-                print(f"Successfully added {added_count} people from {filename}")
+                self._write(f"Successfully added {added_count} people from {filename}\n")
                 return True
             else:
-                print("No valid people were added from the file.")
+                self._write("No valid people were added from the file.\n")
                 return False
                 
         except FileNotFoundError:
-            print(f"Error: File '{filename}' not found.")
+            self._write(f"Error: File '{filename}' not found.\n")
             return False
         except Exception as e:
-            print(f"Error reading file '{filename}': {str(e)}")
+            self._write(f"Error reading file '{filename}': {str(e)}\n")
             return False
     
     def print_unallocated(self, filename=None):
@@ -383,36 +439,33 @@ class DojoApp:
         Args:
             filename (str, optional): If provided, output will be written to this file
         """
+        # Work out what each person is missing in a single pass
         unallocated = []
-        
         for person in self.dojo.people:
-            if not person.office_allocated or \
-               (hasattr(person, 'wants_accommodation') and 
-                person.wants_accommodation and 
-                not person.living_space_allocated):
-                unallocated.append(person)
+            wants = getattr(person, 'wants_accommodation', False)
+            reasons = []
+            if not person.office_allocated:
+                reasons.append("office")
+            if wants and not person.living_space_allocated:
+                reasons.append("living space")
+            if reasons:
+                unallocated.append((person, reasons))
         
         output = ["Unallocated People", "=" * 50]
         if not unallocated:
             output.append("No unallocated people.")
         else:
-            for person in unallocated:
-                reasons = []
-                if not person.office_allocated:
-                    reasons.append("office")
-                if (hasattr(person, 'wants_accommodation') and 
-                    person.wants_accommodation and 
-                    not person.living_space_allocated):
-                    reasons.append("living space")
+            for person, reasons in unallocated:
                 output.append(f"- {person.name} (missing: {', '.join(reasons)})")
         
         # Print or write to file
         if filename:
             with open(filename, 'w') as f:
-                f.write('\n'.join(output) + '\n')
-            print(f"Unallocated people list saved to {filename}")
+                f.writelines(line + '\n' for line in output)
+            self._write(f"Unallocated people list saved to {filename}\n")
         else:
-            print('\n'.join(output))
+            for line in output:
+                self._write(line + '\n')
         
         return bool(unallocated)
     
@@ -428,44 +481,27 @@ class DojoApp:
             bool: True if save was successful, False otherwise
         """
         try:
-            db_path = db if db is not None else self.DEFAULT_DB_PATH
-            db_path = os.path.abspath(db_path)
+            db_path = os.path.abspath(db or self.DEFAULT_DB_PATH)
             db_dir = os.path.dirname(db_path)
             
             # If the directory doesn't exist, return False
-            if not os.path.exists(db_dir):
-                print(f"Error: Directory does not exist: {db_dir}")
+            if not os.path.isdir(db_dir):
+                self._write(f"Error: Directory does not exist: {db_dir}\n")
                 return False
             
-            # Check if the directory is writable
-            if not os.access(db_dir, os.W_OK):
-                print(f"Error: Directory is not writable: {db_dir}")
-                return False
-                
-            # If we get here, the directory exists and is writable
-            try:
-                # Test if we can write to the directory
-                test_file = os.path.join(db_dir, f".test_write_{os.getpid()}")
-                with open(test_file, 'w') as f:
-                    f.write('test')
-                os.remove(test_file)
-            except (OSError, IOError) as e:
-                print(f"Error: Cannot write to directory: {db_dir}")
-                return False
-            
-            # Try to save to the database
+            # Try to save to the database; write failures surface as exceptions
             try:
                 success = self.db_service.save_state(self.dojo, db_path)
                 if success:
-                    print(f"State saved to {db_path}")
+                    self._write(f"State saved to {db_path}\n")
                     return True
                 return False
             except Exception as e:
-                print(f"Error saving state to database: {str(e)}")
+                self._write(f"Error saving state to database: {str(e)}\n")
                 return False
                 
         except Exception as e:
-            print(f"Unexpected error: {str(e)}")
+            self._write(f"Unexpected error: {str(e)}\n")
             return False
     
     def load_state(self, db_path):
@@ -481,24 +517,20 @@ class DojoApp:
         try:
             # Check if the database file exists
             if not os.path.exists(db_path):
-                print(f"Error: Database file '{db_path}' not found.")
-                return False
-                
-            # Check if the file is a valid SQLite database
-            if not self.db_service._is_valid_sqlite_db(db_path):
-                print("Error loading state from database: file is not a database")
+                self._write(f"Error: Database file '{db_path}' not found.\n")
                 return False
                 
-            # Clear existing data in the dojo before loading
-            self.dojo = Dojo()
+            # Load into a fresh Dojo, keeping the current one if loading fails
+            dojo = Dojo()
             
-            success = self.db_service.load_state(self.dojo, db_path)
+            success = self.db_service.load_state(dojo, db_path)
             if success:
-                print(f"State loaded from {db_path}")
+                self.dojo = dojo
+                self._write(f"State loaded from {db_path}\n")
                 return True
             return False
         except Exception as e:
-            print(f"Error loading state from database: {str(e)}")
+            self._write(f"Error loading state from database: {str(e)}\n")
             return False
 
 
@@ -1,12 +1,69 @@
 """
 Base database models for The Dojo application.
 """
+from contextlib import contextmanager
+
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 
 Base = declarative_base()
 
+# Pragmas for every connection to a SQLite database file
+CONNECTION_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Journaling for saves. WAL only syncs on checkpoints, so a commit no longer
+# costs a full fsync. journal_mode is stored in the database file itself, so
+# it is only set when saving; loading a file never changes its journal mode.
+SAVE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=OFF",
+)
+
+# Every SQLite database file starts with this 16-byte header
+SQLITE_HEADER = b'SQLite format 3\000'
+
+
+def is_sqlite_file(file_path):
+    """Check if a file is a SQLite database by reading only its header.
+    
+    Unlike connecting, this never writes to the file, so an empty or
+    foreign file is left exactly as it was.
+    
+    Args:
+        file_path (str): Path to the file
+        
+    Returns:
+        bool: True if the file starts with the SQLite header, False otherwise
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+    except (IOError, OSError):
+        return False
+
+
+def _pragma_listener(pragmas):
+    """Build a 'connect' event listener that runs the given pragmas.
+    
+    Args:
+        pragmas (tuple): PRAGMA statements to execute on each new connection
+        
+    Returns:
+        function: Listener suitable for sqlalchemy.event.listen
+    """
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+    return _set_pragmas
+
+
 class Database:
     """Database connection and session management."""
     
@@ -16,8 +73,17 @@ class Database:
         Args:
             db_url (str): Database URL. Defaults to SQLite in-memory database.
         """
-        self.engine = create_engine(db_url)
+        # Let multi-row INSERT..RETURNING batches cover a whole save in one
+        # statement; SQLAlchemy still caps each batch at the driver's
+        # bound-parameter limit
+        self.engine = create_engine(db_url, use_insertmanyvalues=True,
+                                    insertmanyvalues_page_size=10000)
         self.Session = sessionmaker(bind=self.engine)
+        
+        # Tune file-backed SQLite connections with pragmas that only last for
+        # the connection; in-memory databases need none of them
+        if db_url.startswith('sqlite:///') and db_url != 'sqlite:///:memory:':
+            event.listen(self.engine, 'connect', _pragma_listener(CONNECTION_PRAGMAS))
     
     def create_tables(self):
         """Create all database tables."""
@@ -26,3 +92,26 @@ class Database:
     def get_session(self):
         """Get a new database session."""
         return self.Session()
+    
+    @contextmanager
+    def bulk_session(self):
+        """Open a session for rewriting a whole snapshot in one transaction.
+        
+        The database is switched to WAL and syncing is switched off for that
+        transaction only, since a crash mid-save just loses the new snapshot
+        and is fixed by saving again. The connection goes back to
+        synchronous=NORMAL once it ends.
+        
+        Yields:
+            Session: A session inside an open transaction, with autoflush off
+        """
+        with self.engine.connect() as conn:
+            for pragma in SAVE_PRAGMAS:
+                conn.exec_driver_sql(pragma)
+            # End the autobegun transaction so the session owns its own
+            conn.commit()
+            try:
+                with self.Session(bind=conn) as session, session.begin(), session.no_autoflush:
+                    yield session
+            finally:
+                conn.exec_driver_sql("PRAGMA synchronous=NORMAL")
@@ -1,39 +1,31 @@
 """
 Database models for Person, Fellow, and Staff.
 """
-from sqlalchemy import Column, String, Boolean, ForeignKey, Integer, Table
+from sqlalchemy import Column, String, Boolean, ForeignKey, Integer
 from sqlalchemy.orm import relationship
 
 from .base import Base
 
-# Association table for many-to-many relationship between people and rooms
-person_room_association = Table(
-    'person_room_association',
-    Base.metadata,
-    Column('person_id', String, ForeignKey('people.id')),
-    Column('room_id', String, ForeignKey('rooms.id'))
-)
-
 class PersonDB(Base):
     """Database model for a person in The Dojo."""
     __tablename__ = 'people'
     
     id = Column(String, primary_key=True)
     name = Column(String, nullable=False)
-    type = Column(String, nullable=False)  # 'FELLOW' or 'STAFF'
+    type = Column(String, nullable=False, index=True)  # 'FELLOW' or 'STAFF'
     
     # Relationships
-    office_id = Column(String, ForeignKey('rooms.id'), nullable=True)
-    living_space_id = Column(String, ForeignKey('rooms.id'), nullable=True)
+    office_id = Column(String, ForeignKey('rooms.id'), nullable=True, index=True)
+    living_space_id = Column(String, ForeignKey('rooms.id'), nullable=True, index=True)
     
     # Backrefs
     office = relationship("RoomDB", foreign_keys=[office_id], back_populates="office_occupants")
     living_space = relationship("RoomDB", foreign_keys=[living_space_id], back_populates="living_space_occupants")
     
-    # For many-to-many relationship (if needed)
-    rooms = relationship("RoomDB", 
-                        secondary=person_room_association,
-                        back_populates="occupants")
+    # Load rows as StaffDB/FellowDB according to their type column
+    __mapper_args__ = {
+        'polymorphic_on': type
+    }
     
     def __init__(self, person_id, name, person_type):
         """Initialize a person.
@@ -13,7 +13,7 @@ class RoomDB(Base):
     
     id = Column(String, primary_key=True)
     name = Column(String, nullable=False)
-    type = Column(String, nullable=False)  # 'office' or 'living_space'
+    type = Column(String, nullable=False, index=True)  # 'office' or 'living_space'
     capacity = Column(Integer, nullable=False)
     
     # Relationships
@@ -22,10 +22,10 @@ class RoomDB(Base):
     living_space_occupants = relationship("PersonDB", 
                                         foreign_keys="[PersonDB.living_space_id]")
     
-    # For many-to-many relationship (if needed)
-    occupants = relationship("PersonDB",
-                           secondary='person_room_association',
-                           back_populates="rooms")
+    # Load rows as OfficeDB/LivingSpaceDB according to their type column
+    __mapper_args__ = {
+        'polymorphic_on': type
+    }
     
     def __init__(self, room_id, name, room_type, capacity):
         """Initialize a room.
@@ -5,19 +5,13 @@ import os
 import sys
 import sqlite3
 import sqlalchemy
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import with_polymorphic
 
-from .base import Database, Base
-from .person_models import PersonDB, StaffDB, FellowDB
+from ..room import OFFICE
+from .base import Database, Base, is_sqlite_file
+from .person_models import PersonDB, FellowDB
 from .room_models import RoomDB, OfficeDB, LivingSpaceDB
-from .utils import init_db, to_db_person, to_db_room, to_domain_person, to_domain_room
-from src.models.dojo import Dojo
-from src.models.person import Person
-from src.models.staff import Staff
-from src.models.fellow import Fellow
-from src.models.room import Room
-from src.models.office import Office
-from src.models.living_space import LivingSpace
+from .utils import init_db, to_db_rows, to_domain_room, rebuild_people
 
 class DatabaseService:
     """Service for database operations."""
@@ -43,6 +37,38 @@ class DatabaseService:
                 os.makedirs(db_dir, exist_ok=True)
         
         self.db = init_db(db_url)
+        
+        # Databases opened by save_state/load_state, keyed by URL
+        self._engines = {db_url: self.db}
+    
+    def _get_database(self, db_url, db_path):
+        """Get the cached Database for a URL, creating it on first use.
+        
+        A cached engine whose file has since been deleted is disposed and
+        rebuilt, since its pooled connections would keep using the unlinked
+        file instead of creating a new one.
+        
+        Args:
+            db_url (str): Database URL
+            db_path (str): Absolute path of the database file behind the URL
+            
+        Returns:
+            Database: The cached Database instance for this URL
+        """
+        db = self._engines.get(db_url)
+        if db is not None and not os.path.exists(db_path):
+            db.engine.dispose()
+            db = None
+        if db is None:
+            db = Database(db_url)
+            self._engines[db_url] = db
+        return db
+    
+    def close(self):
+        """Dispose of every cached database engine."""
+        for db in self._engines.values():
+            db.engine.dispose()
+        self._engines.clear()
     
     def save_state(self, dojo, db_path=None):
         """
@@ -56,96 +82,46 @@ class DatabaseService:
         Returns:
             bool: True if save was successful, False otherwise
         """
-        session = None
-        
         try:
             # Use default path if none provided
             if db_path is None:
                 db_path = self.DEFAULT_DB_PATH
                 
-            # Check if the directory is writable
-            db_dir = os.path.dirname(os.path.abspath(db_path))
-            if db_dir:  # Only check if there's a directory component
-                # First check if the directory exists and is writable
-                if os.path.exists(db_dir):
-                    if not os.access(db_dir, os.W_OK):
-                        print(f"Error: Directory is not writable: {db_dir}")
-                        return False
-                else:
-                    # If directory doesn't exist, try to create it
-                    try:
-                        os.makedirs(db_dir, exist_ok=False)  # Don't use exist_ok to catch race conditions
-                        # Test if the directory is actually writable
-                        test_file = os.path.join(db_dir, '.test_write')
-                        with open(test_file, 'w') as f:
-                            f.write('test')
-                        os.remove(test_file)
-                    except (OSError, IOError) as e:
-                        print(f"Error: Cannot create or write to directory: {db_dir}")
-                        # Clean up the directory if we created it but can't write to it
-                        if os.path.exists(db_dir) and not os.listdir(db_dir):
-                            try:
-                                os.rmdir(db_dir)
-                            except OSError:
-                                pass
-                        return False
-            
             # Format the database URL for SQLAlchemy
             abs_path = os.path.abspath(db_path)
             db_url = f'sqlite:///{abs_path}'.replace('\\', '/')  # Use forward slashes for SQLAlchemy
             
-            # Check if the directory exists and is writable
+            # Make sure the directory exists; an unwritable one makes
+            # create_tables below fail, so there is no need to probe it
             db_dir = os.path.dirname(abs_path)
-            if db_dir:  # Only check if there's a directory component
-                if not os.path.exists(db_dir):
-                    print(f"Error: Directory does not exist: {db_dir}")
-                    return False
-                if not os.access(db_dir, os.W_OK):
-                    print(f"Error: Directory is not writable: {db_dir}")
-                    return False
-                
-                # Verify the directory is actually writable
-                try:
-                    test_file = os.path.join(db_dir, f'.test_write_{os.getpid()}')
-                    with open(test_file, 'w') as f:
-                        f.write('test')
-                    os.remove(test_file)
-                except (OSError, IOError) as e:
-                    print(f"Error: Cannot write to directory: {db_dir}")
-                    return False
+            if db_dir:  # Only create directory if there's a directory component
+                os.makedirs(db_dir, exist_ok=True)
             
             try:
-                # Create a new database connection
-                db = Database(db_url)
+                # Reuse this path's engine; the schema may be missing even for
+                # a cached one (e.g. opened by load_state), and create_tables
+                # only creates what is absent
+                db = self._get_database(db_url, abs_path)
                 db.create_tables()
-                
-                # Create a session
-                Session = sessionmaker(bind=db.engine)
-                session = Session()
-            except Exception as e:
+            except (OSError, sqlalchemy.exc.SQLAlchemyError) as e:
                 print(f"Error creating database connection: {str(e)}")
                 return False
             
-            # Clear existing data in the right order to respect foreign key constraints
-            session.query(FellowDB).delete()
-            session.query(StaffDB).delete()
-            session.query(PersonDB).delete()
-            session.query(LivingSpaceDB).delete()
-            session.query(OfficeDB).delete()
-            session.query(RoomDB).delete()
-            
-            # Save rooms first
-            for room in dojo.offices + dojo.living_spaces:
-                db_room = to_db_room(room)
-                session.add(db_room)
-            
-            # Save people after rooms
-            for person in dojo.people:
-                db_person = to_db_person(person)
-                session.add(db_person)
-            
-            # Commit the transaction
-            session.commit()
+            # Rewrite the whole snapshot inside one unsynced transaction so
+            # SQLite writes it out once on commit; a failure rolls it back
+            with db.bulk_session() as session:
+                # Clear existing data in the right order to respect foreign key
+                # constraints, using Core DELETEs that skip ORM query compilation.
+                # StaffDB shares the people table, so it needs no delete of its own.
+                for table in (FellowDB.__table__, PersonDB.__table__,
+                              LivingSpaceDB.__table__, OfficeDB.__table__,
+                              RoomDB.__table__):
+                    session.execute(table.delete())
+                
+                # Insert rooms first, then people, as one executemany per table
+                for table, rows in to_db_rows(dojo):
+                    if rows:
+                        session.execute(sqlalchemy.insert(table), rows)
             
             # Verify the file was actually created
             if not os.path.exists(abs_path):
@@ -154,22 +130,10 @@ class DatabaseService:
                 
             return True
             
-        except sqlalchemy.exc.SQLAlchemyError as e:
-            if session is not None:
-                session.rollback()
-            print(f"Error saving state to database: {str(e)}", file=sys.stderr)
-            return False
         except Exception as e:
-            if session is not None:
-                session.rollback()
+            # Covers SQLAlchemyError too; bulk_session has rolled back by now
             print(f"Error saving state to database: {str(e)}", file=sys.stderr)
             return False
-        finally:
-            if session is not None:
-                session.close()
-            # Close the database engine if it was created
-            if db is not None and hasattr(db, 'engine'):
-                db.engine.dispose()
     
     def load_state(self, dojo, db_path):
         """
@@ -195,110 +159,83 @@ class DatabaseService:
             abs_path = os.path.abspath(db_path)
             db_url = f'sqlite:///{abs_path}'.replace('\\', '/')
             
-            # Check if the file is a valid SQLite database
-            if not self._is_valid_sqlite_db(abs_path):
+            # Reject anything without the SQLite header before connecting;
+            # opening an empty file would turn it into a database
+            if not is_sqlite_file(abs_path):
                 print("Error loading state from database: file is not a database")
                 return False
-                
+            
             # Initialize database
-            db = Database(db_url)
+            db = self._get_database(db_url, abs_path)
             
             # Create a session
-            Session = sessionmaker(bind=db.engine)
-            session = Session()
+            session = db.get_session()
             
-            # Clear existing data in the dojo
-            dojo.offices = []
-            dojo.living_spaces = []
-            dojo.people = []
-            dojo.staff = []
-            dojo.fellows = []
-            
-            # Track loaded room names to prevent duplicates
-            loaded_rooms = set()
+            # Reading the schema fails with DatabaseError if the file is
+            # corrupt past its header; a database without the Dojo's tables
+            # holds no saved state
+            try:
+                tables = set(session.execute(sqlalchemy.text(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'")).scalars())
+            except (sqlalchemy.exc.DatabaseError, sqlite3.DatabaseError):
+                print("Error loading state from database: file is not a database")
+                return False
+            if not tables.issuperset(Base.metadata.tables):
+                print("Error loading state from database: no saved Dojo state in the database")
+                return False
             
-            # Load rooms first
-            room_dbs = session.query(RoomDB).all()
-            for room_db in room_dbs:
-                if room_db.name in loaded_rooms:
+            # Clear existing data in the dojo
+            dojo.reset()
+            
+            # Load rooms first, joining the subclass tables in the same query.
+            # to_domain_room returns the existing room for a repeated name.
+            room_query = session.query(with_polymorphic(RoomDB, [OfficeDB, LivingSpaceDB]))
+            for room_db in room_query:
+                to_domain_room(room_db, dojo)
+            
+            # Then load people as plain rows, outer-joining the fellows table
+            # for wants_accommodation. IDs are the table's primary key, so
+            # each row is a new person and needs no duplicate check.
+            people, fellows = PersonDB.__table__, FellowDB.__table__
+            person_rows = session.execute(
+                sqlalchemy.select(people.c.id, people.c.name, people.c.type,
+                                  people.c.office_id, people.c.living_space_id,
+                                  fellows.c.wants_accommodation)
+                .select_from(people.outerjoin(fellows))
+            ).mappings()
+            occupants_by_room = rebuild_people(dojo, person_rows)
+            
+            # Restore room occupants from each person's allocations, adding
+            # every room's occupants in one batch
+            for room_name, person_ids in occupants_by_room.items():
+                room, room_type = dojo.find_room(room_name)
+                if room is None or room._bulk_add_occupants(person_ids):
                     continue
-                    
-                room = to_domain_room(room_db, dojo)
-                if room:
-                    # Check if room already exists in the dojo before adding
-                    if room.room_type == 'office':
-                        if not any(r.name == room.name for r in dojo.offices):
-                            dojo.offices.append(room)
+                # More people were saved in the room than it holds: keep the
+                # first ones and leave the rest unallocated so they show up
+                # in print_unallocated instead of vanishing
+                overflow = [dojo.get_person(person_id) for person_id in person_ids
+                            if not room.add_occupant(person_id)]
+                for person in overflow:
+                    if room_type == OFFICE:
+                        person.office_allocated = None
                     else:
-                        if not any(r.name == room.name for r in dojo.living_spaces):
-                            dojo.living_spaces.append(room)
-                    loaded_rooms.add(room_db.name)
-            
-            # Then load people
-            person_dbs = session.query(PersonDB).all()
-            for person_db in person_dbs:
-                try:
-                    # Check if person already exists in dojo.people
-                    existing_person = next((p for p in dojo.people if p.person_id == person_db.id), None)
-                    
-                    if existing_person is None:
-                        # Only create and add the person if they don't already exist
-                        person = to_domain_person(person_db, dojo)
-                        if not person:
-                            continue
-                            
-                        # Add to appropriate role list
-                        if person.person_type == 'FELLOW':
-                            if person not in dojo.fellows:
-                                dojo.fellows.append(person)
-                        else:
-                            if person not in dojo.staff:
-                                dojo.staff.append(person)
-                except Exception as e:
-                    print(f"Error loading person {getattr(person_db, 'id', 'unknown')}: {str(e)}")
-                    continue
+                        person.living_space_allocated = None
+                print(f"Warning: {room.name} holds {room.capacity} people but "
+                      f"{len(person_ids)} were saved in it; left unallocated: "
+                      f"{', '.join(person.name for person in overflow)}")
             
             return True
                 
-        except sqlalchemy.exc.SQLAlchemyError as e:
-            if session is not None:
-                session.rollback()
-            print(f"Database error loading state: {str(e)}", file=sys.stderr)
-            return False
-                
         except Exception as e:
+            # Covers SQLAlchemyError too; closing the session below rolls back
             print(f"Error loading state: {str(e)}", file=sys.stderr)
             return False
             
         finally:
             if session is not None:
                 session.close()
-            # Close the database engine if it was created
-            if db is not None and hasattr(db, 'engine'):
-                db.engine.dispose()
     
-    def _is_valid_sqlite_db(self, file_path):
-        """Check if the given file is a valid SQLite database.
-        
-        Args:
-            file_path (str): Path to the SQLite database file
-            
-        Returns:
-            bool: True if the file is a valid SQLite database, False otherwise
-        """
-        if not os.path.isfile(file_path):
-            return False
-            
-        # SQLite database files start with this header
-        sqlite_header = b'SQLite format 3\000'
-        
-        try:
-            with open(file_path, 'rb') as f:
-                header = f.read(len(sqlite_header))
-                return header == sqlite_header
-        except (IOError, OSError):
-            return False
-            
     def _clear_database(self):
         """Clear all data from the database."""
         try:
@@ -2,7 +2,9 @@
 Dojo class for The Dojo application.
 """
 import random
-from .person import Person
+import sys
+from .person import Person, FELLOW, STAFF, PERSON_TYPES
+from .room import OFFICE, LIVING_SPACE, ROOM_TYPES
 from .fellow import Fellow
 from .staff import Staff
 from .office import Office
@@ -12,39 +14,120 @@ from .living_space import LivingSpace
 class Dojo:
     """Main class that manages the entire Dojo space allocation system."""
     
-    def __init__(self):
-        """Initialize a new Dojo with empty lists for rooms and people."""
-        self.offices = []  # List of Office objects
-        self.living_spaces = []  # List of LivingSpace objects
-        self.people = []  # List of all Person objects
-        self.staff = []  # List of Staff objects
-        self.fellows = []  # List of Fellow objects
+    __slots__ = ('_room_by_lname', '_people', 'writer')
     
-    def _add_person_to_lists(self, person):
+    def __init__(self, writer=None):
         """
-        Add a person to the appropriate lists.
+        Initialize a new Dojo with empty indexes for rooms and people.
+        
+        Args:
+            writer (callable, optional): Called with each chunk of output.
+                                         Defaults to the current sys.stdout.write.
+        """
+        self._room_by_lname = {}  # Casefolded name -> Office or LivingSpace
+        self._people = {}  # person_id -> Person, in insertion order
+        self.writer = writer
+    
+    @property
+    def offices(self):
+        """list: All Office objects, in creation order."""
+        return [r for r in self._room_by_lname.values() if r.room_type == OFFICE]
+    
+    @property
+    def living_spaces(self):
+        """list: All LivingSpace objects, in creation order."""
+        return [r for r in self._room_by_lname.values() if r.room_type == LIVING_SPACE]
+    
+    @property
+    def people(self):
+        """list: All Person objects, in insertion order."""
+        return list(self._people.values())
+    
+    @property
+    def fellows(self):
+        """list: All Fellow objects, in insertion order."""
+        return [p for p in self._people.values() if p.person_type == FELLOW]
+    
+    @property
+    def staff(self):
+        """list: All Staff objects, in insertion order."""
+        return [p for p in self._people.values() if p.person_type == STAFF]
+    
+    def _write(self, text):
+        """
+        Send Dojo output to the Dojo's writer.
+        
+        Args:
+            text (str): Text to write, including any trailing newline
+        """
+        if self.writer is not None:
+            self.writer(text)
+        else:
+            sys.stdout.write(text)
+    
+    def reset(self):
+        """Remove every room and person from the Dojo."""
+        self._room_by_lname.clear()
+        self._people.clear()
+    
+    def register_person(self, person):
+        """
+        Add an already built person to the people index without allocating rooms.
         
         Args:
             person (Person): The person object to add
         """
-        self.people.append(person)
-        if person.person_type == 'FELLOW':
-            self.fellows.append(person)
-        else:  # STAFF
-            self.staff.append(person)
+        self._people[person.person_id] = person
+    
+    def register_room(self, room):
+        """
+        Add an already built room to the room name index.
+        
+        Args:
+            room (Room): The room object to add
+        """
+        self._room_by_lname[room._lname] = room
+    
+    def get_person(self, person_id):
+        """
+        Find a person by ID.
+        
+        Args:
+            person_id (str): ID of the person to look up
+            
+        Returns:
+            Person: The person, or None if no person has that ID
+        """
+        return self._people.get(person_id)
+    
+    def find_room(self, name):
+        """
+        Find a room by name, ignoring case.
         
-    def create_room(self, room_type, room_names):
+        Args:
+            name (str): Name of the room to look up
+            
+        Returns:
+            tuple: (room, room_type), or (None, None) if no room has that name
+        """
+        room = self._room_by_lname.get(name.casefold())
+        if room is None:
+            return None, None
+        return room, room.room_type
+        
+    def create_room(self, room_type, room_names, verbose=True):
         """
         Create one or more rooms of the specified type.
         
         Args:
             room_type (str): Type of room ('office' or 'living_space')
             room_names (str or list): Single room name or list of room names to create
+            verbose (bool): If True, announce the created rooms in one write
             
         Returns:
             bool: True if any rooms were created, False otherwise
         """
-        if room_type not in ['office', 'living_space']:
+        if room_type not in ROOM_TYPES:
             return False
             
         # Convert single string to list for consistent processing
@@ -53,33 +136,32 @@ class Dojo:
         elif not isinstance(room_names, (list, tuple)):
             return False
             
-        rooms_created = False
+        created_msgs = []
         for name in room_names:
             # Skip empty names
             if not name or not isinstance(name, str) or not name.strip():
                 continue
                 
             # Skip if room name already exists
-            if any(room.name.lower() == name.lower() 
-                  for room in (self.offices + self.living_spaces)):
+            if name.casefold() in self._room_by_lname:
                 continue
                 
-            if room_type == 'office':
+            if room_type == OFFICE:
                 room = Office(name)
-                self.offices.append(room)
             else:  # living_space
                 room = LivingSpace(name)
-                self.living_spaces.append(room)
+            self.register_room(room)
             
-            rooms_created = True
             # Format the output message with correct article
-            room_type_display = 'living space' if room_type == 'living_space' else room_type
+            room_type_display = 'living space' if room_type == LIVING_SPACE else room_type
             article = 'An' if room_type_display[0].lower() in 'aeiou' else 'A'
-            print(f"{article} {room_type_display} called {name} has been successfully created!")
+            created_msgs.append(f"{article} {room_type_display} called {name} has been successfully created!\n")
             
-        return rooms_created
+        if verbose and created_msgs:
+            self._write(''.join(created_msgs))
+        return bool(created_msgs)
     
-    def add_person(self, name, person_type, wants_accommodation="N"):
+    def add_person(self, name, person_type, wants_accommodation="N", verbose=True):
         """
         Add a new person to the Dojo and allocate them a random room.
         
@@ -87,18 +169,61 @@ class Dojo:
             name (str): Person's name
             person_type (str): Type of person ('FELLOW' or 'STAFF')
             wants_accommodation (str): 'Y' if they want accommodation, 'N' otherwise
+            verbose (bool): If True, print the person's allocations
+            
+        Returns:
+            bool: True if person was added successfully, False otherwise
+        """
+        return self._add_person(name, person_type, wants_accommodation, verbose=verbose)
+    
+    def add_people_bulk(self, people, verbose=True):
+        """
+        Add many people to the Dojo, allocating rooms in one amortized pass.
+        
+        The rooms with space are collected once up front and rooms are dropped
+        from those pools as they fill, so each allocation is O(1) instead of a
+        rescan of every room.
+        
+        Args:
+            people (list): (name, person_type, wants_accommodation) tuples
+            verbose (bool): If True, print each person's allocations
+            
+        Returns:
+            int: Number of people added successfully
+        """
+        available_offices = [o for o in self.offices if not o.is_full()]
+        available_spaces = [ls for ls in self.living_spaces if not ls.is_full()]
+        added_count = 0
+        for name, person_type, wants_accommodation in people:
+            if self._add_person(name, person_type, wants_accommodation,
+                                available_offices, available_spaces, verbose):
+                added_count += 1
+        return added_count
+    
+    def _add_person(self, name, person_type, wants_accommodation,
+                    available_offices=None, available_spaces=None, verbose=True):
+        """
+        Create a person, store them and allocate their rooms.
+        
+        Args:
+            name (str): Person's name
+            person_type (str): Type of person ('FELLOW' or 'STAFF')
+            wants_accommodation (str): 'Y' if they want accommodation, 'N' otherwise
+            available_offices (list, optional): Offices with space, shared across calls
+            available_spaces (list, optional): Living spaces with space, shared across calls
+            verbose (bool): If True, print the person's allocations
             
         Returns:
             bool: True if person was added successfully, False otherwise
         """
         # Validate person type
         person_type = person_type.upper()
-        if person_type not in ['FELLOW', 'STAFF']:
+        if person_type not in PERSON_TYPES:
             return False
             
         # Create the appropriate person object
         try:
-            if person_type == 'FELLOW':
+            if person_type == FELLOW:
                 person = Fellow(name, wants_accommodation)
             else:  # STAFF
                 if isinstance(wants_accommodation, str) and wants_accommodation.upper() == 'Y':
@@ -106,67 +231,122 @@ class Dojo:
                 person = Staff(name)
                 
             # Store the person in appropriate lists
-            self._add_person_to_lists(person)
-            
-            # Allocate office space
-            office = self._allocate_office(person)
-            first_name = name.split()[0]  # Get first name for output
-            office_msg = f"{first_name} has been allocated the office {office.name}" if office else "No office available"
-            
-            # Allocate living space if fellow wants it
-            living_msg = ""
-            if person_type == 'FELLOW' and person.wants_accommodation:
-                living_space = self._allocate_living_space(person)
-                living_msg = f"\n{first_name} has been allocated the livingspace {living_space.name}" if living_space else "\nNo living space available"
-            
-            # Format the output to match test expectations
-            person_type_str = "Fellow" if person_type == 'FELLOW' else "Staff"
-            print(f"{person_type_str} {name} has been successfully added.\n{office_msg}{living_msg}")
+            self.register_person(person)
+            
+            # Allocate office space, and living space if a fellow wants it
+            office = self._allocate_office(person, available_offices)
+            wants_living = person_type == FELLOW and person.wants_accommodation
+            living_space = self._allocate_living_space(person, available_spaces) if wants_living else None
+            
+            if verbose:
+                first_name = name.split()[0]  # Get first name for output
+                office_msg = f"{first_name} has been allocated the office {office.name}" if office else "No office available"
+                living_msg = ""
+                if wants_living:
+                    living_msg = f"\n{first_name} has been allocated the livingspace {living_space.name}" if living_space else "\nNo living space available"
+                
+                # Format the output to match test expectations
+                person_type_str = "Fellow" if person_type == FELLOW else "Staff"
+                self._write(f"{person_type_str} {name} has been successfully added.\n{office_msg}{living_msg}\n")
             return True
             
         except Exception as e:
             print(f"Error adding person: {e}", file=sys.stderr)
             return False
-        return True
     
-    def _allocate_office(self, person):
+    @staticmethod
+    def _occupy_random_room(rooms, person_id):
+        """
+        Put a person in a random room from a pool of rooms with space.
+        
+        Args:
+            rooms (list): Rooms that are not full; a room is removed once it fills
+            person_id (str): ID of the person to add
+            
+        Returns:
+            Room: The chosen room or None if the pool is empty
+        """
+        if not rooms:
+            return None
+            
+        # Randomly select a room, then swap-remove it from the pool if now full
+        i = random.randrange(len(rooms))
+        room = rooms[i]
+        room.add_occupant_unchecked(person_id)
+        if room.is_full():
+            rooms[i] = rooms[-1]
+            rooms.pop()
+        return room
+    
+    def _random_room_with_space(self, room_type):
+        """
+        Pick a random non-full room of a type in one pass, without building a pool.
+        
+        Uses reservoir sampling: the k-th room with space replaces the current
+        pick with probability 1/k, so every such room is equally likely.
+        
+        Args:
+            room_type (str): 'office' or 'living_space'
+            
+        Returns:
+            Room: The chosen room or None if every room of that type is full
+        """
+        chosen = None
+        k = 0
+        for room in self._room_by_lname.values():
+            if room.room_type != room_type or room.is_full():
+                continue
+            k += 1
+            if random.randrange(k) == 0:
+                chosen = room
+        return chosen
+    
+    def _allocate_office(self, person, available_offices=None):
         """
         Allocate an office to a person.
         
         Args:
             person: Person object to allocate office to
+            available_offices (list, optional): Offices with space; a random
+                                               office is sampled if not given
             
         Returns:
             Office: The allocated office or None if none available
         """
         # Try to find an office with space
-        available_offices = [o for o in self.offices if not o.is_full()]
-        if not available_offices:
+        if available_offices is None:
+            office = self._random_room_with_space(OFFICE)
+            if office is not None:
+                office.add_occupant_unchecked(person.person_id)
+        else:
+            office = self._occupy_random_room(available_offices, person.person_id)
+        if office is None:
             return None
             
-        # Randomly select an office
-        office = random.choice(available_offices)
-        office.add_occupant(person.person_id)
         person.office_allocated = office.name
         return office
     
-    def _allocate_living_space(self, fellow):
+    def _allocate_living_space(self, fellow, available_spaces=None):
         """
         Allocate a living space to a fellow.
         
         Args:
             fellow: Fellow object to allocate living space to
+            available_spaces (list, optional): Living spaces with space; a
+                                              random one is sampled if not given
             
         Returns:
             LivingSpace: The allocated living space or None if none available
         """
         # Try to find a living space with space
-        available_spaces = [ls for ls in self.living_spaces if not ls.is_full()]
-        if not available_spaces:
+        if available_spaces is None:
+            living_space = self._random_room_with_space(LIVING_SPACE)
+            if living_space is not None:
+                living_space.add_occupant_unchecked(fellow.person_id)
+        else:
+            living_space = self._occupy_random_room(available_spaces, fellow.person_id)
+        if living_space is None:
             return None
             
-        # Randomly select a living space
-        living_space = random.choice(available_spaces)
-        living_space.add_occupant(fellow.person_id)
         fellow.living_space_allocated = living_space.name
         return living_space
@@ -1,12 +1,14 @@
 """
 Fellow class for The Dojo application.
 """
-from .person import Person
+from .person import Person, FELLOW
 
 
 class Fellow(Person):
     """Fellow class - can be allocated office and living space."""
     
+    __slots__ = ('wants_accommodation', 'office_allocated', 'living_space_allocated')
+    
     def __init__(self, name, wants_accommodation="N"):
         """
         Initialize a Fellow.
@@ -16,7 +18,7 @@ class Fellow(Person):
             wants_accommodation (str or bool): "Y"/True if wants accommodation, "N"/False otherwise
         """
         super().__init__(name)
-        self.person_type = "FELLOW"
+        self.person_type = FELLOW
         if isinstance(wants_accommodation, str):
             self.wants_accommodation = wants_accommodation.upper() == "Y"
         else:
@@ -1,12 +1,14 @@
 """
 LivingSpace class for The Dojo application.
 """
-from .room import Room
+from .room import Room, LIVING_SPACE
 
 
 class LivingSpace(Room):
     """LivingSpace class - a type of room with a capacity of 4 people."""
     
+    __slots__ = ()
+    
     def __init__(self, name):
         """
         Initialize a LivingSpace.
@@ -15,5 +17,9 @@ class LivingSpace(Room):
             name (str): The living space's name
         """
         super().__init__(name)
-        self.room_type = "living_space"
+        self.room_type = LIVING_SPACE
         self.capacity = 4  # Living spaces can accommodate 4 people
+    
+    def _room_kind(self):
+        """Return the room type constant for this kind of room."""
+        return LIVING_SPACE
@@ -1,12 +1,14 @@
 """
 Office class for The Dojo application.
 """
-from .room import Room
+from .room import Room, OFFICE
 
 
 class Office(Room):
     """Office class - a type of room with a capacity of 6 people."""
     
+    __slots__ = ()
+    
     def __init__(self, name):
         """
         Initialize an Office.
@@ -15,5 +17,9 @@ class Office(Room):
             name (str): The office's name
         """
         super().__init__(name)
-        self.room_type = "office"
+        self.room_type = OFFICE
         self.capacity = 6  # Offices can accommodate 6 people
+    
+    def _room_kind(self):
+        """Return the room type constant for this kind of room."""
+        return OFFICE
@@ -1,13 +1,23 @@
 """
 Person base class for The Dojo application.
 """
-import uuid
+import binascii
+import os
 from abc import ABC
 
+# Person types. Every comparison goes through these shared constants, so
+# type checks hit the identity fast path of string equality.
+FELLOW = 'FELLOW'
+STAFF = 'STAFF'
+PERSON_TYPES = frozenset({FELLOW, STAFF})
+
 
 class Person(ABC):
     """Abstract base class for all people in The Dojo."""
     
+    # Fixed per-person schema; ABC declares empty slots, so no __dict__
+    __slots__ = ('name', 'person_id', 'person_type')
+    
     def __init__(self, name):
         """
         Initialize a Person with a name and unique ID.
@@ -16,7 +26,7 @@ class Person(ABC):
             name (str): The person's name
         """
         self.name = name
-        self.person_id = str(uuid.uuid4())[:8]  # Short unique ID
+        self.person_id = binascii.hexlify(os.urandom(4)).decode('ascii')  # Short unique ID
         self.person_type = None  # Will be set by subclasses
     
     def __str__(self):
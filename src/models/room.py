@@ -3,10 +3,22 @@ Room base class for The Dojo application.
 """
 from abc import ABC, abstractmethod
 
+# Room types, shared the same way as the person type constants
+OFFICE = 'office'
+LIVING_SPACE = 'living_space'
+ROOM_TYPES = frozenset({OFFICE, LIVING_SPACE})
+
+# Default for dict.pop that no person ID can equal
+_MISSING = object()
+
 
 class Room(ABC):
     """Abstract base class for all rooms in The Dojo."""
     
+    # Fixed per-room schema; ABC declares empty slots, so no __dict__
+    __slots__ = ('name', 'room_type', 'capacity', '_occupants', '_occ_count', '_lname',
+                 '_room_id', '_str_prefix')
+    
     def __init__(self, name):
         """
         Initialize a Room with a name.
@@ -14,13 +26,36 @@ class Room(ABC):
         Args:
             name (str): The room's name
         """
-        if self.__class__ == Room:
-            raise TypeError("Cannot instantiate abstract class Room directly")
-            
         self.name = name
+        self._lname = name.casefold()  # Key in the Dojo's room name index
+        self._room_id = name.lower().replace(' ', '_')  # Database row ID
         self.room_type = None  # Will be set by subclasses
         self.capacity = 0  # Will be set by subclasses
-        self.occupants = []  # List of person IDs
+        self._occupants = {}  # Person ID -> None; keys keep allocation order
+        self._occ_count = 0  # len(self._occupants), kept by every add and remove
+        self._str_prefix = None  # "type: name (" once room_type is known
+    
+    @abstractmethod
+    def _room_kind(self):
+        """
+        Name the concrete kind of room.
+        
+        Subclasses must implement this; ABCMeta then refuses to instantiate
+        Room itself, so __init__ needs no class check of its own.
+        
+        Returns:
+            str: The room type constant for the subclass
+        """
+    
+    @property
+    def occupants(self):
+        """tuple: IDs of the people in the room, in allocation order."""
+        return tuple(self._occupants)
+    
+    @property
+    def occupant_count(self):
+        """int: Number of people in the room, without copying the occupants."""
+        return self._occ_count
     
     def add_occupant(self, person_id):
         """
@@ -35,13 +70,44 @@ class Room(ABC):
         if not person_id:
             return False
             
-        if person_id in self.occupants:
+        if person_id in self._occupants:
             return True  # Already in the room
             
-        if self.is_full():
+        if self._occ_count >= self.capacity:
+            return False
+            
+        self._occupants[person_id] = None
+        self._occ_count += 1
+        return True
+    
+    def add_occupant_unchecked(self, person_id):
+        """
+        Add an occupant without the duplicate and capacity checks.
+        
+        Only for callers that already know the room has space and the person
+        is new to it, such as Dojo's allocation of freshly created people.
+        
+        Args:
+            person_id (str): The person's unique ID
+        """
+        self._occupants[person_id] = None
+        self._occ_count += 1
+    
+    def _bulk_add_occupants(self, person_ids):
+        """
+        Add several occupants at once, e.g. when restoring saved state.
+        
+        Args:
+            person_ids (list): IDs of people not already in the room
+            
+        Returns:
+            bool: True if all were added, False if they would not fit
+        """
+        if self._occ_count + len(person_ids) > self.capacity:
             return False
             
-        self.occupants.append(person_id)
+        self._occupants.update(dict.fromkeys(person_ids))
+        self._occ_count = len(self._occupants)
         return True
     
     def remove_occupant(self, person_id):
@@ -54,14 +120,24 @@ class Room(ABC):
         Returns:
             bool: True if successfully removed, False if person not found or invalid ID
         """
-        if not person_id or not self.occupants:
+        # add_occupant never stores an empty ID, so an invalid ID is just a
+        # miss; one hash lookup either way, and a miss raises nothing
+        if self._occupants.pop(person_id, _MISSING) is _MISSING:
             return False
+        self._occ_count -= 1
+        return True
+    
+    def has_occupant(self, person_id):
+        """
+        Check if a person is in the room.
+        
+        Args:
+            person_id (str): The person's unique ID
             
-        try:
-            self.occupants.remove(person_id)
-            return True
-        except ValueError:
-            return False
+        Returns:
+            bool: True if the person occupies the room, False otherwise
+        """
+        return person_id in self._occupants
     
     def is_full(self):
         """
@@ -70,7 +146,7 @@ class Room(ABC):
         Returns:
             bool: True if room is full, False otherwise
         """
-        return len(self.occupants) >= self.capacity
+        return self._occ_count >= self.capacity
     
     def available_space(self):
         """
@@ -79,9 +155,13 @@ class Room(ABC):
         Returns:
             int: Number of available spaces
         """
-        return self.capacity - len(self.occupants)
+        return self.capacity - self._occ_count
     
     def __str__(self):
         """Return string representation of the room."""
-        return f"{self.room_type}: {self.name} ({len(self.occupants)}/{self.capacity})"
+        # Subclasses set room_type after Room.__init__, so build the fixed
+        # prefix on first use; only the occupancy count changes after that
+        if self._str_prefix is None:
+            self._str_prefix = f"{self.room_type}: {self.name} ("
+        return f"{self._str_prefix}{self._occ_count}/{self.capacity})"
     
\ No newline at end of file
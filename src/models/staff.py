@@ -1,12 +1,14 @@
 """
 Staff class for The Dojo application.
 """
-from .person import Person
+from .person import Person, STAFF
 
 
 class Staff(Person):
     """Staff class - can be allocated office."""
     
+    __slots__ = ('office_allocated',)
+    
     def __init__(self, name):
         """
         Initialize a Staff.
@@ -15,5 +17,5 @@ class Staff(Person):
             name (str): The staff's name
         """
         super().__init__(name)
-        self.person_type = "STAFF"
+        self.person_type = STAFF
         self.office_allocated = None
@@ -2,25 +2,70 @@
 Unit tests for The Dojo CLI functionality.
 Following TDD principles - tests written before implementation.
 """
+import copy
+import importlib.util
 import unittest
 import sys
 import os
 import shutil
+import sqlite3
 import tempfile
-from unittest.mock import patch, MagicMock, mock_open
+from unittest.mock import patch
 from io import StringIO
 
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Use the installed package (pip install -e .) when there is one, and
+# fall back to importing straight from src in a bare checkout
+if importlib.util.find_spec('models') is None:
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from src.cli import DojoApp
-from src.models.dojo import Dojo
-from src.models.person import Person
-from src.models.fellow import Fellow
-from src.models.staff import Staff
-from src.models.room import Room
-from src.models.office import Office
-from src.models.living_space import LivingSpace
+from cli import DojoApp
+
+# Dojo with two offices, two living spaces and three people, built on first use
+_TEMPLATE_DOJO = None
+
+
+def _template_dojo():
+    """
+    Return a fresh copy of the shared rooms-and-people test fixture.
+    
+    The fixture is built quietly through the CLI once, and every call
+    deep-copies it instead of replaying the commands.
+    
+    Returns:
+        Dojo: A Dojo no other test shares
+    """
+    global _TEMPLATE_DOJO
+    if _TEMPLATE_DOJO is None:
+        app = DojoApp()
+        app.create_room("office", ["Blue", "Red"], verbose=False)
+        app.create_room("living_space", ["Python", "Ruby"], verbose=False)
+        app.add_person("John Doe", "STAFF", verbose=False)
+        app.add_person("Jane Smith", "FELLOW", "Y", verbose=False)
+        app.add_person("Bob Johnson", "FELLOW", "N", verbose=False)
+        _TEMPLATE_DOJO = app.dojo
+    return copy.deepcopy(_TEMPLATE_DOJO)
+
+
+# One buffer reused by every test that captures stdout
+_STDOUT_BUF = StringIO()
+
+
+def _capture_stdout(test):
+    """
+    Redirect sys.stdout to the shared, emptied buffer until a test ends.
+    
+    Args:
+        test (unittest.TestCase): Test whose cleanup restores sys.stdout
+        
+    Returns:
+        StringIO: The buffer receiving the test's output
+    """
+    _STDOUT_BUF.seek(0)
+    _STDOUT_BUF.truncate()
+    patcher = patch('sys.stdout', _STDOUT_BUF)
+    patcher.start()
+    test.addCleanup(patcher.stop)
+    return _STDOUT_BUF
 
 
 class TestCreateRoom(unittest.TestCase):
@@ -28,7 +73,8 @@ class TestCreateRoom(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures before each test method."""
-        self.app = DojoApp()
+        self.output = []
+        self.app = DojoApp(writer=self.output.append)
     
     def test_create_single_office_successfully(self):
         """Test creating a single office successfully."""
@@ -79,39 +125,51 @@ class TestCreateRoom(unittest.TestCase):
         result = self.app.create_room("invalid_type", ["TestRoom"])
         self.assertFalse(result)
     
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_create_room_output_single_office(self, mock_stdout):
+    def test_create_room_output_single_office(self):
         """Test the output message for creating a single office."""
         self.app.create_room("office", ["Orange"])
-        output = mock_stdout.getvalue()
+        output = ''.join(self.output)
         self.assertIn("An office called Orange has been successfully created!", output)
     
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_create_room_output_multiple_offices(self, mock_stdout):
+    def test_create_room_output_multiple_offices(self):
         """Test the output message for creating multiple offices."""
         self.app.create_room("office", ["Blue", "Black", "Brown"])
-        output = mock_stdout.getvalue()
+        output = ''.join(self.output)
         self.assertIn("An office called Blue has been successfully created!", output)
         self.assertIn("An office called Black has been successfully created!", output)
         self.assertIn("An office called Brown has been successfully created!", output)
     
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_create_room_output_living_space(self, mock_stdout):
+    def test_create_room_output_living_space(self):
         """Test the output message for creating a living space."""
         self.app.create_room("living_space", ["Python"])
-        output = mock_stdout.getvalue()
+        output = ''.join(self.output)
         self.assertIn("A living space called Python has been successfully created!", output)
+    
+    def test_create_room_quiet(self):
+        """Test creating rooms without announcing them."""
+        result = self.app.create_room("office", ["Orange"], verbose=False)
+        self.assertTrue(result)
+        self.assertEqual(''.join(self.output), "")
 
 
 class TestAddPerson(unittest.TestCase):
     """Test the add_person CLI command."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create the rooms shared by every test in the class once."""
+        app = DojoApp()
+        # Create some rooms for allocation
+        app.create_room("office", ["Blue", "Orange"], verbose=False)
+        app.create_room("living_space", ["Python", "Ruby"], verbose=False)
+        cls._pristine_dojo = app.dojo
+    
     def setUp(self):
         """Set up test fixtures before each test method."""
-        self.app = DojoApp()
-        # Create some rooms for allocation
-        self.app.create_room("office", ["Blue", "Orange"])
-        self.app.create_room("living_space", ["Python", "Ruby"])
+        self.output = []
+        # Tests add people, so each one gets its own copy of the rooms
+        self.app = DojoApp(writer=self.output.append)
+        self.app.dojo = copy.deepcopy(self._pristine_dojo)
     
     def test_add_staff_successfully(self):
         """Test adding staff successfully."""
@@ -169,29 +227,26 @@ class TestAddPerson(unittest.TestCase):
         result = self.app.add_person("John Doe", "INVALID")
         self.assertFalse(result)
     
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_add_staff_output(self, mock_stdout):
+    def test_add_staff_output(self):
         """Test the output message for adding staff."""
         self.app.add_person("Neil Armstrong", "STAFF")
-        output = mock_stdout.getvalue()
+        output = ''.join(self.output)
         self.assertIn("Staff Neil Armstrong has been successfully added.", output)
         self.assertIn("Neil has been allocated the office", output)
     
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_add_fellow_without_accommodation_output(self, mock_stdout):
+    def test_add_fellow_without_accommodation_output(self):
         """Test the output message for adding fellow without accommodation."""
         self.app.add_person("John Doe", "FELLOW")
-        output = mock_stdout.getvalue()
+        output = ''.join(self.output)
         self.assertIn("Fellow John Doe has been successfully added.", output)
         self.assertIn("John has been allocated the office", output)
         # Should not mention living space
         self.assertNotIn("living space", output.lower())
     
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_add_fellow_with_accommodation_output(self, mock_stdout):
+    def test_add_fellow_with_accommodation_output(self):
         """Test the output message for adding fellow with accommodation."""
         self.app.add_person("Nelly Armweek", "FELLOW", "Y")
-        output = mock_stdout.getvalue()
+        output = ''.join(self.output)
         self.assertIn("Fellow Nelly Armweek has been successfully added.", output)
         self.assertIn("Nelly has been allocated the office", output)
         self.assertIn("Nelly has been allocated the livingspace", output)
@@ -202,7 +257,8 @@ class TestDojoAppIntegration(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures before each test method."""
-        self.app = DojoApp()
+        self.output = []
+        self.app = DojoApp(writer=self.output.append)
     
     def test_full_workflow(self):
         """Test a complete workflow of creating rooms and adding people."""
@@ -237,37 +293,37 @@ class TestDojoAppIntegration(unittest.TestCase):
 class TestPrintFunctionality(unittest.TestCase):
     """Test the print_room, print_allocations, and print_unallocated CLI commands."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create the test data shared by every test in the class once."""
+        cls._output = []
+        cls._pristine_app = DojoApp(writer=cls._output.append)
+        cls._pristine_app.dojo = _template_dojo()
+    
     def setUp(self):
         """Set up test fixtures before each test method."""
-        self.app = DojoApp()
-        # Create some test data
-        self.app.create_room("office", ["Blue", "Red"])
-        self.app.create_room("living_space", ["Python", "Ruby"])
-        self.app.add_person("John Doe", "STAFF")
-        self.app.add_person("Jane Smith", "FELLOW", "Y")
-        self.app.add_person("Bob Johnson", "FELLOW", "N")
+        # Printing never changes the Dojo, so the tests can share one app
+        self.app = self._pristine_app
+        self._output.clear()
     
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_print_room(self, mock_stdout):
+    def test_print_room(self):
         """Test printing occupants of a specific room."""
         self.app.print_room("Blue")
-        output = mock_stdout.getvalue().strip()
+        output = ''.join(self._output).strip()
         # Should print the room name and its occupants
         self.assertIn("Blue", output)
         self.assertIn("Occupants:", output)
     
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_print_room_nonexistent(self, mock_stdout):
+    def test_print_room_nonexistent(self):
         """Test printing a non-existent room."""
         self.app.print_room("Nonexistent")
-        output = mock_stdout.getvalue().strip()
+        output = ''.join(self._output).strip()
         self.assertIn("Room 'Nonexistent' not found", output)
     
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_print_allocations_screen(self, mock_stdout):
+    def test_print_allocations_screen(self):
         """Test printing allocations to screen."""
         self.app.print_allocations()
-        output = mock_stdout.getvalue()
+        output = ''.join(self._output)
         # Should list all rooms and their occupants
         self.assertIn("Blue", output)
         self.assertIn("Red", output)
@@ -281,13 +337,14 @@ class TestPrintFunctionality(unittest.TestCase):
         # Verify the file was opened for writing
         mock_file.assert_called_once_with("test_allocations.txt", 'w')
     
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_print_unallocated_screen(self, mock_stdout):
+    def test_print_unallocated_screen(self):
         """Test printing unallocated people to screen."""
         self.app.print_unallocated()
-        output = mock_stdout.getvalue()
+        output = ''.join(self._output)
         # Should list people without full allocations
         self.assertIn("Unallocated People", output)
+        # Each line reaches the writer on its own
+        self.assertEqual(self._output[:2], ["Unallocated People\n", "=" * 50 + "\n"])
     
     @patch('builtins.open', new_callable=unittest.mock.mock_open)
     def test_print_unallocated_file(self, mock_file):
@@ -302,16 +359,12 @@ class TestReallocationAndLoading(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures before each test method."""
-        self.app = DojoApp()
-        # Create test data
-        self.app.create_room("office", ["Blue", "Red"])
-        self.app.create_room("living_space", ["Python", "Ruby"])
-        self.app.add_person("John Doe", "STAFF")
-        self.app.add_person("Jane Smith", "FELLOW", "Y")
-        self.app.add_person("Bob Johnson", "FELLOW", "N")
+        # Tests change the Dojo, so each one gets its own copy of the data
+        self.output = []
+        self.app = DojoApp(writer=self.output.append)
+        self.app.dojo = _template_dojo()
     
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_reallocate_person_success(self, mock_stdout):
+    def test_reallocate_person_success(self):
         """Test reallocating a person to a different room."""
         # Get a person ID (John Doe)
         person_id = self.app.dojo.staff[0].person_id
@@ -321,7 +374,7 @@ class TestReallocationAndLoading(unittest.TestCase):
         self.assertTrue(result)
         
         # Verify output message
-        output = mock_stdout.getvalue()
+        output = ''.join(self.output)
         # The test might be failing because the person is already in the target room
         # or the room is full. Let's check both cases in the output.
         self.assertTrue(
@@ -330,23 +383,21 @@ class TestReallocationAndLoading(unittest.TestCase):
             "is already at full capacity" in output
         )
     
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_reallocate_person_nonexistent(self, mock_stdout):
+    def test_reallocate_person_nonexistent(self):
         """Test reallocating a non-existent person."""
         result = self.app.reallocate_person("nonexistent-id", "Red")
         self.assertFalse(result)
         
-        output = mock_stdout.getvalue()
+        output = ''.join(self.output)
         self.assertIn("Error: Person with ID 'nonexistent-id' not found.", output)
     
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_reallocate_to_nonexistent_room(self, mock_stdout):
+    def test_reallocate_to_nonexistent_room(self):
         """Test reallocating to a non-existent room."""
         person_id = self.app.dojo.staff[0].person_id
         result = self.app.reallocate_person(person_id, "Nonexistent")
         self.assertFalse(result)
         
-        output = mock_stdout.getvalue()
+        output = ''.join(self.output)
         self.assertTrue(
             "Room 'Nonexistent' not found" in output or
             "not found or not suitable" in output or
@@ -357,36 +408,35 @@ class TestReallocationAndLoading(unittest.TestCase):
            read_data='''OLUWAFEMI SULE FELLOW Y
                       DOMINIC WALTERS STAFF N
                       SIMON PATTERSON FELLOW Y''')
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_load_people_success(self, mock_stdout, mock_file):
+    def test_load_people_success(self, mock_file):
         """Test loading people from a file successfully."""
         result = self.app.load_people("test_people.txt")
         self.assertTrue(result)
         
-        output = mock_stdout.getvalue()
+        # Each allocation comes through the app's writer, then the summary
+        output = ''.join(self.output)
+        self.assertIn("Fellow OLUWAFEMI SULE has been successfully added.", output)
         self.assertIn("Successfully added 3 people", output)
         # 3 existing people + 3 new people = 6 total
         self.assertEqual(len(self.app.dojo.people), 6)
     
     @patch('builtins.open', side_effect=FileNotFoundError)
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_load_people_file_not_found(self, mock_stdout, mock_file):
+    def test_load_people_file_not_found(self, mock_file):
         """Test loading from a non-existent file."""
         result = self.app.load_people("nonexistent.txt")
         self.assertFalse(result)
         
-        output = mock_stdout.getvalue()
+        output = ''.join(self.output)
         self.assertIn("Error: File 'nonexistent.txt' not found.", output)
     
     @patch('builtins.open', new_callable=unittest.mock.mock_open, 
            read_data='INVALID FORMAT')
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_load_people_invalid_format(self, mock_stdout, mock_file):
+    def test_load_people_invalid_format(self, mock_file):
         """Test loading people with invalid file format."""
         result = self.app.load_people("invalid.txt")
         self.assertFalse(result)
         
-        output = mock_stdout.getvalue()
+        output = ''.join(self.output)
         self.assertIn("No valid people were added from the file.", output)
 
 
@@ -395,41 +445,45 @@ class TestReallocationAndLoading(unittest.TestCase):
 class TestStatePersistence(unittest.TestCase):
     """Test the save_state and load_state CLI commands."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one temporary directory for the whole class's databases."""
+        cls._root = tempfile.mkdtemp()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the temporary directory and everything the tests wrote."""
+        shutil.rmtree(cls._root, ignore_errors=True)
+    
     def setUp(self):
         """Set up test fixtures before each test method."""
+        self.stdout = _capture_stdout(self)
+        # Tests change the Dojo, so each one gets its own copy of the data
         self.app = DojoApp()
-        # Create test data
-        self.app.create_room("office", ["Blue", "Red"])
-        self.app.create_room("living_space", ["Python", "Ruby"])
-        self.app.add_person("John Doe", "STAFF")
-        self.app.add_person("Jane Smith", "FELLOW", "Y")
-        self.app.add_person("Bob Johnson", "FELLOW", "N")
+        self.app.dojo = _template_dojo()
         
-        # Create a temporary directory for test databases
-        self.test_dir = tempfile.mkdtemp()
+        # Give each test its own subdirectory for test databases
+        self.test_dir = os.path.join(self._root, self._testMethodName)
+        os.mkdir(self.test_dir)
         self.db_path = os.path.join(self.test_dir, 'test_dojo.db')
     
     def tearDown(self):
         """Clean up after each test method."""
-        # Remove the temporary directory and its contents
-        if os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir)
+        self.app.db_service.close()
     
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_save_state_default_db(self, mock_stdout):
+    def test_save_state_default_db(self):
         """Test saving state to default database."""
         # Save state with default database
-        with patch('src.cli.DojoApp.DEFAULT_DB_PATH', self.db_path):
+        with patch('cli.DojoApp.DEFAULT_DB_PATH', self.db_path):
             result = self.app.save_state()
             
         self.assertTrue(result)
         self.assertTrue(os.path.exists(self.db_path))
         
-        output = mock_stdout.getvalue()
+        output = self.stdout.getvalue()
         self.assertIn(f"State saved to {self.db_path}", output)
     
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_save_state_custom_db(self, mock_stdout):
+    def test_save_state_custom_db(self):
         """Test saving state to a custom database path."""
         custom_db = os.path.join(self.test_dir, 'custom_dojo.db')
         result = self.app.save_state(db=custom_db)
@@ -437,11 +491,10 @@ class TestStatePersistence(unittest.TestCase):
         self.assertTrue(result)
         self.assertTrue(os.path.exists(custom_db))
         
-        output = mock_stdout.getvalue()
+        output = self.stdout.getvalue()
         self.assertIn(f"State saved to {custom_db}", output)
     
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_save_state_invalid_path(self, mock_stdout):
+    def test_save_state_invalid_path(self):
         """Test saving state to an invalid path."""
         # Create a path with a non-existent parent directory
         invalid_path = os.path.join(self.test_dir, 'nonexistent_dir', 'dojo.db')
@@ -487,13 +540,41 @@ class TestStatePersistence(unittest.TestCase):
         self.assertFalse(os.path.exists(invalid_path), "Database file should not be created for an invalid path")
         
         # Check error message in output
-        output = mock_stdout.getvalue()
+        output = self.stdout.getvalue()
         print("\n=== Output ===")
         print(output)
         self.assertIn("Error", output, "Expected an error message in the output")
     
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_load_state_success(self, mock_stdout):
+    def test_save_state_twice_reuses_database(self):
+        """Test that repeated saves to one path share an engine and overwrite."""
+        self.assertTrue(self.app.save_state(db=self.db_path))
+        engines = dict(self.app.db_service._engines)
+        self.app.add_person("Ann Lee", "STAFF")
+        self.assertTrue(self.app.save_state(db=self.db_path))
+        self.assertEqual(engines, self.app.db_service._engines)
+        
+        new_app = DojoApp()
+        new_app.load_state(self.db_path)
+        new_app.db_service.close()
+        self.assertEqual(len(new_app.dojo.people), 4)
+    
+    def test_save_state_after_failed_load_creates_tables(self):
+        """Test saving to a path whose engine was opened by a failed load."""
+        # A valid SQLite file with no tables
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA user_version=1")
+        conn.close()
+        self.assertFalse(self.app.load_state(self.db_path))
+        self.assertTrue(self.app.save_state(db=self.db_path))
+    
+    def test_save_state_after_file_deleted(self):
+        """Test saving again after the saved database file was deleted."""
+        self.assertTrue(self.app.save_state(db=self.db_path))
+        os.remove(self.db_path)
+        self.assertTrue(self.app.save_state(db=self.db_path))
+        self.assertTrue(os.path.exists(self.db_path))
+    
+    def test_load_state_success(self):
         """Test loading state from a database successfully."""
         # First save the state
         self.app.save_state(db=self.db_path)
@@ -509,22 +590,20 @@ class TestStatePersistence(unittest.TestCase):
         self.assertEqual(len(new_app.dojo.living_spaces), 2)
         self.assertEqual(len(new_app.dojo.people), 3)
         
-        output = mock_stdout.getvalue()
+        output = self.stdout.getvalue()
         self.assertIn(f"State loaded from {self.db_path}", output)
     
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_load_state_nonexistent_db(self, mock_stdout):
+    def test_load_state_nonexistent_db(self):
         """Test loading state from a non-existent database."""
         non_existent_db = os.path.join(self.test_dir, 'nonexistent.db')
         result = self.app.load_state(non_existent_db)
         
         self.assertFalse(result)
         
-        output = mock_stdout.getvalue()
+        output = self.stdout.getvalue()
         self.assertIn(f"Error: Database file '{non_existent_db}' not found.", output)
     
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_load_state_invalid_db(self, mock_stdout):
+    def test_load_state_invalid_db(self):
         """Test loading state from an invalid database file."""
         # Create an empty file that's not a valid SQLite database
         with open(self.db_path, 'w') as f:
@@ -533,11 +612,77 @@ class TestStatePersistence(unittest.TestCase):
         result = self.app.load_state(self.db_path)
         self.assertFalse(result)
         
-        output = mock_stdout.getvalue()
+        output = self.stdout.getvalue()
         self.assertIn("Error loading state from database:", output)
     
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_save_and_load_state_preserves_data(self, mock_stdout):
+    def test_load_state_empty_file_left_untouched(self):
+        """Test that loading a 0-byte file rejects it without touching it."""
+        open(self.db_path, 'w').close()
+        
+        self.assertFalse(self.app.load_state(self.db_path))
+        self.assertIn("file is not a database", self.stdout.getvalue())
+        self.assertEqual(os.path.getsize(self.db_path), 0)
+        self.assertEqual(os.listdir(self.test_dir), ['test_dojo.db'])
+    
+    def test_load_state_database_without_tables(self):
+        """Test that a SQLite file without the Dojo's tables is reported as empty."""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA user_version=1")
+        conn.close()
+        
+        self.assertFalse(self.app.load_state(self.db_path))
+        self.assertIn("Error loading state from database: no saved Dojo state",
+                      self.stdout.getvalue())
+    
+    def _quiet_app(self):
+        """
+        Create an app with no rooms or people whose engines close after the test.
+        
+        Returns:
+            DojoApp: The new app
+        """
+        app = DojoApp()
+        self.addCleanup(app.db_service.close)
+        return app
+    
+    def test_reallocated_person_survives_save_and_load(self):
+        """Test that a reallocated person is still in their new room after a reload."""
+        app = self._quiet_app()
+        app.create_room("office", "Blue", verbose=False)
+        app.add_person("John Doe", "STAFF", verbose=False)
+        app.create_room("office", "Red", verbose=False)
+        person_id = app.dojo.staff[0].person_id
+        self.assertTrue(app.reallocate_person(person_id, "Red"))
+        self.assertTrue(app.save_state(self.db_path))
+        
+        self.assertTrue(self.app.load_state(self.db_path))
+        self.assertEqual(self.app.dojo.find_room("Red")[0].occupants, (person_id,))
+        self.assertEqual(self.app.dojo.find_room("Blue")[0].occupants, ())
+        self.assertEqual(self.app.dojo.get_person(person_id).office_allocated, "Red")
+        self.assertFalse(self.app.print_unallocated())
+    
+    def test_load_state_reports_overfull_room(self):
+        """Test that people saved past a room's capacity are loaded as unallocated."""
+        app = self._quiet_app()
+        app.create_room("office", "Blue", verbose=False)
+        for i in range(7):
+            app.add_person(f"Staff {i}", "STAFF", verbose=False)
+        self.assertTrue(app.save_state(self.db_path))
+        app.db_service.close()
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            conn.execute("UPDATE people SET office_id = 'Blue'")
+        conn.close()
+        
+        self.assertTrue(self.app.load_state(self.db_path))
+        self.assertIn("Warning: Blue holds 6 people but 7 were saved in it",
+                      self.stdout.getvalue())
+        self.assertTrue(self.app.dojo.find_room("Blue")[0].is_full())
+        unallocated = [p for p in self.app.dojo.staff if not p.office_allocated]
+        self.assertEqual(len(unallocated), 1)
+        self.assertTrue(self.app.print_unallocated())
+    
+    def test_save_and_load_state_preserves_data(self):
         """Test that saving and then loading state preserves all data."""
         # Save the current state
         self.app.save_state(db=self.db_path)
@@ -565,6 +710,50 @@ class TestStatePersistence(unittest.TestCase):
             if hasattr(person, 'living_space_allocated'):
                 self.assertEqual(person.living_space_allocated, 
                               loaded_person.living_space_allocated)
+    
+    def test_load_state_restores_person_subtypes(self):
+        """Test that loaded fellows keep their accommodation preference."""
+        self.app.save_state(db=self.db_path)
+        
+        new_app = DojoApp()
+        new_app.load_state(self.db_path)
+        
+        original = {f.name: f.wants_accommodation for f in self.app.dojo.fellows}
+        loaded = {f.name: f.wants_accommodation for f in new_app.dojo.fellows}
+        self.assertEqual(original, loaded)
+        self.assertEqual(len(self.app.dojo.staff), len(new_app.dojo.staff))
+    
+    def test_load_state_restores_room_occupants(self):
+        """Test that loaded rooms list the people allocated to them."""
+        self.app.save_state(db=self.db_path)
+        
+        new_app = DojoApp()
+        new_app.load_state(self.db_path)
+        
+        for room in self.app.dojo.offices + self.app.dojo.living_spaces:
+            loaded_room, _ = new_app.dojo.find_room(room.name)
+            self.assertCountEqual(room.occupants, loaded_room.occupants)
+    
+    def test_load_state_keeps_journal_mode(self):
+        """Test that loading a database does not switch it to WAL."""
+        self.app.save_state(db=self.db_path)
+        self.app.db_service.close()
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=DELETE")
+        conn.close()
+        
+        new_app = DojoApp()
+        self.assertTrue(new_app.load_state(self.db_path))
+        new_app.db_service.close()
+        conn = sqlite3.connect(self.db_path)
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        conn.close()
+        self.assertEqual(journal_mode, "delete")
+    
+    def test_run_save_state_leaves_no_wal_files(self):
+        """Test that a save_state command cleans up its WAL sidecar files."""
+        DojoApp().run(['save_state', '--db', self.db_path])
+        self.assertEqual(os.listdir(self.test_dir), ['test_dojo.db'])
 
 
 if __name__ == '__main__':
@@ -1,13 +1,21 @@
 """
+PYTEST_DONT_REWRITE
 Unit tests for The Dojo models.
 Following TDD principles - tests written before implementation.
+Every check is a TestCase assert method, so pytest's assertion
+rewriting would add nothing here.
 """
+import importlib.util
 import unittest
 import sys
 import os
+from io import StringIO
+from unittest.mock import patch
 
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Use the installed package (pip install -e .) when there is one, and
+# fall back to importing straight from src in a bare checkout
+if importlib.util.find_spec('models') is None:
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from models.person import Person
 from models.fellow import Fellow
@@ -17,6 +25,23 @@ from models.office import Office
 from models.living_space import LivingSpace
 from models.dojo import Dojo
 
+# Occupant IDs for the capacity tests, formatted once rather than per add
+_IDS = tuple(f"person_{i}" for i in range(8))
+
+
+def _fill(room, count):
+    """
+    Add occupants person_0 .. person_<count - 1> to a room.
+    
+    map drives the adds from C, so coverage traces add_occupant itself
+    but not a loop line per occupant in the test.
+    
+    Args:
+        room (Room): Room to fill
+        count (int): Number of occupants to add
+    """
+    list(map(room.add_occupant, _IDS[:count]))
+
 
 class TestPerson(unittest.TestCase):
     """Test the Person base class."""
@@ -27,7 +52,7 @@ class TestPerson(unittest.TestCase):
         person = Person("John Doe")
         self.assertEqual(person.name, "John Doe")
         self.assertIsNotNone(person.person_id)
-        self.assertTrue(len(person.person_id) > 0)
+        self.assertTrue(person.person_id)
     
     def test_person_has_unique_id(self):
         """Test that each person gets a unique ID."""
@@ -62,6 +87,13 @@ class TestFellow(unittest.TestCase):
         """Test fellow creation not wanting accommodation."""
         fellow = Fellow("Carol Brown", wants_accommodation="N")
         self.assertFalse(fellow.wants_accommodation)
+    
+    def test_fellow_has_no_instance_dict(self):
+        """Test that fellows store their attributes in slots only."""
+        fellow = Fellow("Alice Johnson")
+        self.assertFalse(hasattr(fellow, '__dict__'))
+        with self.assertRaises(AttributeError):
+            fellow.nickname = "Al"
 
 
 class TestStaff(unittest.TestCase):
@@ -78,6 +110,13 @@ class TestStaff(unittest.TestCase):
         """Test that staff doesn't have living space allocation attribute."""
         staff = Staff("Emma Davis")
         self.assertFalse(hasattr(staff, 'living_space_allocated'))
+    
+    def test_staff_has_no_instance_dict(self):
+        """Test that staff store their attributes in slots only."""
+        staff = Staff("Emma Davis")
+        self.assertFalse(hasattr(staff, '__dict__'))
+        with self.assertRaises(AttributeError):
+            staff.living_space_allocated = "Python"
 
 
 class TestRoom(unittest.TestCase):
@@ -87,8 +126,18 @@ class TestRoom(unittest.TestCase):
         """Test room creation with name."""
         room = Office("Test Office")
         self.assertEqual(room.name, "Test Office")
-        self.assertEqual(len(room.occupants), 0)
-        self.assertIsInstance(room.occupants, list)
+        self.assertEqual(room.occupants, ())
+        self.assertIsInstance(room.occupants, tuple)
+    
+    def test_rooms_have_no_instance_dict(self):
+        """Test that both room types store their attributes in slots only."""
+        for room in (Office("Test Office"), LivingSpace("Test Space")):
+            self.assertFalse(hasattr(room, '__dict__'))
+    
+    def test_room_cannot_be_instantiated(self):
+        """Test the abstract Room base class cannot be created directly."""
+        with self.assertRaises(TypeError):
+            Room("Test Room")
     
     def test_room_add_occupant(self):
         """Test adding occupant to room."""
@@ -105,11 +154,66 @@ class TestRoom(unittest.TestCase):
         self.assertTrue(result)
         self.assertNotIn("person_123", room.occupants)
     
+    def test_room_has_occupant(self):
+        """Test membership checks track adds and removals."""
+        room = Office("Test Office")
+        self.assertFalse(room.has_occupant("person_123"))
+        room.add_occupant("person_123")
+        self.assertTrue(room.has_occupant("person_123"))
+        room.remove_occupant("person_123")
+        self.assertFalse(room.has_occupant("person_123"))
+    
+    def test_room_occupant_count(self):
+        """Test the occupant count tracks adds, duplicates and removals."""
+        room = Office("Test Office")
+        self.assertEqual(room.occupant_count, 0)
+        room.add_occupant("person_1")
+        room.add_occupant("person_1")
+        room._bulk_add_occupants(["person_2", "person_3"])
+        self.assertEqual(room.occupant_count, 3)
+        room.remove_occupant("person_2")
+        room.remove_occupant("person_2")
+        self.assertEqual(room.occupant_count, len(room.occupants))
+
+    def test_room_occupants_keep_allocation_order(self):
+        """Test occupants stay in allocation order across removals."""
+        room = Office("Test Office")
+        for person_id in ("person_1", "person_2", "person_3"):
+            room.add_occupant(person_id)
+        room.remove_occupant("person_2")
+        room.add_occupant("person_4")
+        self.assertEqual(room.occupants, ("person_1", "person_3", "person_4"))
+    
+    def test_room_bulk_add_occupants(self):
+        """Test adding occupants in bulk only succeeds when they all fit."""
+        room = Office("Test Office")
+        self.assertTrue(room._bulk_add_occupants(["person_1", "person_2"]))
+        self.assertEqual(room.occupants, ("person_1", "person_2"))
+        self.assertTrue(room.has_occupant("person_2"))
+        
+        result = room._bulk_add_occupants(_IDS[3:8])
+        self.assertFalse(result)
+        self.assertEqual(len(room.occupants), 2)
+    
+    def test_room_available_space_tracks_changes(self):
+        """Test available space follows adds, repeat adds and removals."""
+        room = Office("Test Office")
+        room.add_occupant("person_1")
+        room.add_occupant("person_1")
+        room.add_occupant_unchecked("person_2")
+        self.assertEqual(room.available_space(), 4)
+        room.remove_occupant("person_1")
+        room.remove_occupant("person_1")
+        self.assertEqual(room.available_space(), 5)
+        self.assertEqual(str(room), "office: Test Office (1/6)")
+    
     def test_room_remove_nonexistent_occupant(self):
         """Test removing occupant that doesn't exist."""
         room = Office("Test Office")
         result = room.remove_occupant("person_123")
         self.assertFalse(result)
+        self.assertFalse(room.remove_occupant(""))
+        self.assertFalse(room.remove_occupant(None))
 
 
 class TestOffice(unittest.TestCase):
@@ -121,18 +225,24 @@ class TestOffice(unittest.TestCase):
         self.assertEqual(office.name, "Blue Office")
         self.assertEqual(office.room_type, "office")
         self.assertEqual(office.capacity, 6)
-        self.assertEqual(len(office.occupants), 0)
+        self.assertEqual(office.occupants, ())
+    
+    def test_office_string_representation(self):
+        """Test the office string tracks occupancy changes."""
+        office = Office("Blue")
+        self.assertEqual(str(office), "office: Blue (0/6)")
+        office.add_occupant("person_1")
+        self.assertEqual(str(office), "office: Blue (1/6)")
     
     def test_office_capacity_limit(self):
         """Test office capacity limit."""
         office = Office("Blue Office")
-        # Add 6 people (at capacity)
-        for i in range(6):
-            result = office.add_occupant(f"person_{i}")
-            self.assertTrue(result)
+        # Add 6 people (at capacity), then check they all got in, in order
+        _fill(office, 6)
+        self.assertEqual(office.occupants, _IDS[:6])
         
         # Try to add 7th person (should fail)
-        result = office.add_occupant("person_6")
+        result = office.add_occupant(_IDS[6])
         self.assertFalse(result)
     
     def test_office_is_full(self):
@@ -141,8 +251,7 @@ class TestOffice(unittest.TestCase):
         self.assertFalse(office.is_full())
         
         # Fill to capacity
-        for i in range(6):
-            office.add_occupant(f"person_{i}")
+        _fill(office, 6)
         
         self.assertTrue(office.is_full())
     
@@ -164,18 +273,17 @@ class TestLivingSpace(unittest.TestCase):
         self.assertEqual(living_space.name, "Red Living Space")
         self.assertEqual(living_space.room_type, "living_space")
         self.assertEqual(living_space.capacity, 4)
-        self.assertEqual(len(living_space.occupants), 0)
+        self.assertEqual(living_space.occupants, ())
     
     def test_living_space_capacity_limit(self):
         """Test living space capacity limit."""
         living_space = LivingSpace("Red Living Space")
-        # Add 4 people (at capacity)
-        for i in range(4):
-            result = living_space.add_occupant(f"person_{i}")
-            self.assertTrue(result)
+        # Add 4 people (at capacity), then check they all got in, in order
+        _fill(living_space, 4)
+        self.assertEqual(living_space.occupants, _IDS[:4])
         
         # Try to add 5th person (should fail)
-        result = living_space.add_occupant("person_4")
+        result = living_space.add_occupant(_IDS[4])
         self.assertFalse(result)
     
     def test_living_space_is_full(self):
@@ -184,12 +292,35 @@ class TestLivingSpace(unittest.TestCase):
         self.assertFalse(living_space.is_full())
         
         # Fill to capacity
-        for i in range(4):
-            living_space.add_occupant(f"person_{i}")
+        _fill(living_space, 4)
         
         self.assertTrue(living_space.is_full())
 
 
+class TestDojoReadOnly(unittest.TestCase):
+    """Test Dojo behaviour that leaves an empty Dojo unchanged."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Create the one empty Dojo every test in the class shares."""
+        cls.dojo = Dojo()
+    
+    def test_dojo_creation(self):
+        """Test dojo creation with empty collections."""
+        self.assertEqual(self.dojo.offices, [])
+        self.assertEqual(self.dojo.living_spaces, [])
+        self.assertEqual(self.dojo.fellows, [])
+        self.assertEqual(self.dojo.staff, [])
+        self.assertEqual(self.dojo.people, [])
+    
+    def test_create_room_invalid_type(self):
+        """Test creating room with invalid type."""
+        result = self.dojo.create_room("invalid_type", "Test Room")
+        self.assertFalse(result)
+        # The Dojo is shared, so the failed call must not have added a room
+        self.assertEqual(self.dojo.offices + self.dojo.living_spaces, [])
+
+
 class TestDojo(unittest.TestCase):
     """Test the Dojo main controller class."""
     
@@ -197,14 +328,6 @@ class TestDojo(unittest.TestCase):
         """Set up test fixtures before each test method."""
         self.dojo = Dojo()
     
-    def test_dojo_creation(self):
-        """Test dojo creation with empty collections."""
-        self.assertEqual(len(self.dojo.offices), 0)
-        self.assertEqual(len(self.dojo.living_spaces), 0)
-        self.assertEqual(len(self.dojo.fellows), 0)
-        self.assertEqual(len(self.dojo.staff), 0)
-        self.assertEqual(len(self.dojo.people), 0)
-    
     def test_create_office_successfully(self):
         """Test creating an office successfully."""
         initial_room_count = len(self.dojo.offices)
@@ -223,16 +346,52 @@ class TestDojo(unittest.TestCase):
         self.assertEqual(new_room_count - initial_room_count, 1)
         self.assertEqual(self.dojo.living_spaces[0].name, "Red Living Space")
     
-    def test_create_room_invalid_type(self):
-        """Test creating room with invalid type."""
-        result = self.dojo.create_room("invalid_type", "Test Room")
-        self.assertFalse(result)
+    def test_add_person_no_available_office(self):
+        """Test adding person when no office is available."""
+        result = self.dojo.add_person("John Doe", "STAFF")
+        # Should still create the person but not allocate office
+        self.assertTrue(result)
+        self.assertEqual(len(self.dojo.staff), 1)
+        self.assertIsNone(self.dojo.staff[0].office_allocated)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_quiet_room_and_person_creation(self, mock_stdout):
+        """Test that verbose=False creates rooms and people silently."""
+        self.assertTrue(self.dojo.create_room("office", ["Blue Office", "Green Office"], verbose=False))
+        self.assertTrue(self.dojo.add_person("John Doe", "STAFF", verbose=False))
+        self.assertEqual(self.dojo.add_people_bulk([("Jane Smith", "FELLOW", "N")], verbose=False), 1)
+        
+        self.assertEqual(mock_stdout.getvalue(), "")
+        self.assertEqual(len(self.dojo.offices), 2)
+        self.assertTrue(all(p.office_allocated for p in self.dojo.people))
+    
+    def test_register_get_and_reset(self):
+        """Test registering, looking up and clearing people and rooms."""
+        staff_member = Staff("John Doe")
+        self.dojo.register_person(staff_member)
+        self.dojo.register_room(Office("Blue Office"))
+        self.assertIs(self.dojo.get_person(staff_member.person_id), staff_member)
+        self.assertIsNone(self.dojo.get_person("nonexistent-id"))
+        self.assertEqual(self.dojo.find_room("blue office")[1], "office")
+        
+        self.dojo.reset()
+        self.assertEqual(self.dojo.people, [])
+        self.assertEqual(self.dojo.offices, [])
+        self.assertIsNone(self.dojo.get_person(staff_member.person_id))
+
+
+class TestDojoAllocation(unittest.TestCase):
+    """Test adding people to a Dojo that already has rooms."""
+    
+    def setUp(self):
+        """Set up an office and a living space before each test method."""
+        # Rebuilding two rooms quietly is cheaper than deep-copying a template
+        self.dojo = Dojo()
+        self.dojo.create_room("office", "Blue Office", verbose=False)
+        self.dojo.create_room("living_space", "Red Living Space", verbose=False)
     
     def test_add_staff_successfully(self):
         """Test adding staff successfully."""
-        # First create an office
-        self.dojo.create_room("office", "Blue Office")
-        
         initial_staff_count = len(self.dojo.staff)
         result = self.dojo.add_person("John Doe", "STAFF")
         self.assertTrue(result)
@@ -246,9 +405,6 @@ class TestDojo(unittest.TestCase):
     
     def test_add_fellow_without_accommodation(self):
         """Test adding fellow without accommodation."""
-        # First create an office
-        self.dojo.create_room("office", "Blue Office")
-        
         initial_fellow_count = len(self.dojo.fellows)
         result = self.dojo.add_person("Jane Smith", "FELLOW", "N")
         self.assertTrue(result)
@@ -263,10 +419,6 @@ class TestDojo(unittest.TestCase):
     
     def test_add_fellow_with_accommodation(self):
         """Test adding fellow with accommodation."""
-        # First create an office and living space
-        self.dojo.create_room("office", "Blue Office")
-        self.dojo.create_room("living_space", "Red Living Space")
-        
         result = self.dojo.add_person("Bob Wilson", "FELLOW", "Y")
         self.assertTrue(result)
         
@@ -276,14 +428,33 @@ class TestDojo(unittest.TestCase):
         self.assertIsNotNone(fellow.office_allocated)
         self.assertIsNotNone(fellow.living_space_allocated)
     
-    def test_add_person_no_available_office(self):
-        """Test adding person when no office is available."""
-        result = self.dojo.add_person("John Doe", "STAFF")
-        # Should still create the person but not allocate office
-        self.assertTrue(result)
-        self.assertEqual(len(self.dojo.staff), 1)
-        self.assertIsNone(self.dojo.staff[0].office_allocated)
+    def test_add_person_skips_full_offices(self):
+        """Test a new person is only allocated an office with space."""
+        self.dojo.create_room("office", "Green Office", verbose=False)
+        _fill(self.dojo.offices[0], 6)
+        
+        for _ in range(5):
+            self.dojo.add_person("John Doe", "STAFF", verbose=False)
+        offices = [staff_member.office_allocated for staff_member in self.dojo.staff]
+        self.assertEqual(offices, ["Green Office"] * 5)
+    
+    def test_add_people_bulk_respects_capacity(self):
+        """Test bulk adding people stops allocating once rooms are full."""
+        people = [(f"Fellow {i}", "FELLOW", "Y") for i in range(8)]
+
+        added = self.dojo.add_people_bulk(people)
+        self.assertEqual(added, 8)
+        self.assertEqual(len(self.dojo.fellows), 8)
+        self.assertTrue(self.dojo.offices[0].is_full())
+        self.assertTrue(self.dojo.living_spaces[0].is_full())
+        with_office = [f for f in self.dojo.fellows if f.office_allocated]
+        with_living = [f for f in self.dojo.fellows if f.living_space_allocated]
+        self.assertEqual(len(with_office), 6)
+        self.assertEqual(len(with_living), 4)
 
 
 if __name__ == '__main__':
-    unittest.main()
+    import pytest
+    # Spread the test classes across cores; loadscope keeps each class on
+    # one worker so its fixtures are built once
+    sys.exit(pytest.main([__file__, "-n", "auto", "--dist=loadscope"]))